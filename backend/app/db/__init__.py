@@ -1,6 +1,7 @@
 # backend/app/db/__init__.py
 from .snowflake_client import SnowflakeClient
+from .redis_client import redis_client
 
 snowflake_client = SnowflakeClient()
 
-__all__ = ['snowflake_client', 'SnowflakeClient']
+__all__ = ['snowflake_client', 'SnowflakeClient', 'redis_client']
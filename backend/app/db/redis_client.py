@@ -0,0 +1,29 @@
+# backend/app/db/redis_client.py
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "20"))
+
+MOCK_ENABLED = not REDIS_URL
+
+# Shared async client (connection-pooled). None means callers fall back to
+# their in-memory stores.
+redis_client = None
+
+if not MOCK_ENABLED:
+    try:
+        import redis.asyncio as aioredis
+
+        redis_client = aioredis.from_url(
+            REDIS_URL,
+            decode_responses=False,
+            max_connections=REDIS_MAX_CONNECTIONS
+        )
+    except ImportError:
+        print("⚠️ redis package not installed. Using in-memory stores.")
+        MOCK_ENABLED = True
+else:
+    print("⚠️ REDIS_URL not set. Using in-memory stores.")
@@ -203,6 +203,18 @@ class SnowflakeClient:
             ) CLUSTER BY (CREATED_AT, USER_ID, NOTIFICATION_TYPE)
         """)
 
+        # Snowflake has no secondary indexes; search optimization gives the
+        # per-user notification list (user + status/type filters) point
+        # lookups instead of scanning every micro-partition
+        try:
+            cursor.execute("""
+                ALTER TABLE RAW.NOTIFICATIONS ADD SEARCH OPTIMIZATION
+                ON EQUALITY(USER_ID, STATUS, NOTIFICATION_TYPE)
+            """)
+        except Exception as e:
+            # Needs Enterprise edition; the table works without it
+            print(f"Search optimization unavailable for RAW.NOTIFICATIONS: {e}")
+
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS RAW.NOTIFICATION_DELIVERIES (
                 DELIVERY_ID STRING PRIMARY KEY,
@@ -351,6 +363,62 @@ class SnowflakeClient:
             conn.rollback()
             return {"status": "error", "error": str(e)}
 
+    async def batch_insert_symptom_records(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if not records:
+            return {"status": "success", "inserted": 0, "layer": "RAW"}
+
+        conn = await self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            now = datetime.utcnow()
+            insert_data = []
+            audit_data = []
+            for i, record in enumerate(records):
+                event_id = record.get("id", f"evt_{now.timestamp()}_{i}")
+                insert_data.append((
+                    event_id,
+                    record.get("user_id", "anonymous"),
+                    record.get("description", ""),
+                    json.dumps(record.get("patient_data", {})),
+                    record.get("source", "api"),
+                    json.dumps(record)
+                ))
+                audit_data.append((
+                    f"log_{now.timestamp()}_{i}",
+                    record.get("user_id") or "system",
+                    "INSERT",
+                    "SYMPTOM_RECORD",
+                    event_id,
+                    json.dumps({"timestamp": now.isoformat()})
+                ))
+
+            # executemany can't rewrite INSERT ... SELECT PARSE_JSON(%s) into a
+            # multi-row insert, so bind every row into one VALUES list and
+            # parse the JSON columns in the SELECT over it
+            cursor.execute(f"""
+                INSERT INTO RAW.SYMPTOM_EVENTS
+                (EVENT_ID, USER_ID, SYMPTOM_DESCRIPTION, PATIENT_DATA, SOURCE_TYPE, RAW_PAYLOAD)
+                SELECT column1, column2, column3, PARSE_JSON(column4), column5, PARSE_JSON(column6)
+                FROM VALUES {_values_placeholders(len(insert_data), 6)}
+            """, _flatten(insert_data))
+
+            # One audit row per record, same as insert_symptom_record
+            if not MOCK_ENABLED:
+                cursor.execute(f"""
+                    INSERT INTO AUDIT.DATA_ACCESS_LOG
+                    (LOG_ID, USER_ID, ACTION, RESOURCE_TYPE, RESOURCE_ID, REQUEST_METADATA)
+                    SELECT column1, column2, column3, column4, column5, PARSE_JSON(column6)
+                    FROM VALUES {_values_placeholders(len(audit_data), 6)}
+                """, _flatten(audit_data))
+
+            conn.commit()
+            return {"status": "success", "inserted": len(records), "layer": "RAW"}
+
+        except Exception as e:
+            conn.rollback()
+            return {"status": "error", "error": str(e)}
+
     async def insert_diagnosis_event(self, symptom_id: str, diagnosis_data: Dict) -> Dict:
         conn = await self._get_connection()
         cursor = conn.cursor()
@@ -755,6 +823,16 @@ class MockSnowflakeConnection:
         pass
 
 
+def _values_placeholders(rows: int, columns: int) -> str:
+    """VALUES list of pyformat placeholders: (%s, %s), (%s, %s), ..."""
+    row = "(" + ", ".join(["%s"] * columns) + ")"
+    return ", ".join([row] * rows)
+
+
+def _flatten(rows: List[tuple]) -> List[Any]:
+    return [value for row in rows for value in row]
+
+
 class MockCursor:
     def __init__(self, mock_file):
         self.mock_file = mock_file
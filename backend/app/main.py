@@ -1,9 +1,56 @@
+import asyncio
+import json
+from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from app.services import ai_service, elevenlabs_service, vector_service
 from app.routers import symptoms, financial, analytics, agents, ai_doctor, doctors, predictions, photon, insights, notifications
 
-app = FastAPI(title="SensoryX API")
 
+# Common symptom descriptions analyzed at startup to pre-populate the cache
+TOP_QUERIES_PATH = Path(__file__).parent / "top_queries.json"
+
+_warm_task = None
+
+
+class UnhandledErrorMiddleware:
+    """
+    Turn uncaught endpoint errors into the JSON 500 the routers used to
+    build in per-endpoint try/except
+
+    Added before CORSMiddleware so the 500 still carries CORS headers
+    (an Exception handler on the app would run outside CORS).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if response_started:
+                raise
+            response = JSONResponse(status_code=500, content={"detail": str(exc)})
+            await response(scope, receive, send)
+
+
+app = FastAPI(title="SensoryX API", default_response_class=ORJSONResponse)
+
+app.add_middleware(UnhandledErrorMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
@@ -24,6 +71,27 @@ app.include_router(insights.router, prefix="/api/insights", tags=["Real-Time Ins
 app.include_router(notifications.router, prefix="/api/notifications", tags=["Smart Notifications"])
 
 
+@app.on_event("startup")
+async def warm_caches():
+    global _warm_task
+    try:
+        queries = json.loads(TOP_QUERIES_PATH.read_text())
+    except (OSError, ValueError) as e:
+        print(f"Skipping cache warm-up: {e}")
+        return
+    # Runs in the background so startup doesn't wait on the model calls
+    _warm_task = asyncio.create_task(ai_service.warm_analysis_cache(queries))
+
+
+@app.on_event("shutdown")
+async def close_shared_clients():
+    if _warm_task is not None:
+        _warm_task.cancel()
+    vector_service.close()
+    await elevenlabs_service.close()
+    await ai_service.close()
+
+
 @app.get("/")
 async def root():
     return {"message": "SensoryX backend is live 🚀"}
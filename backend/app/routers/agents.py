@@ -1,12 +1,23 @@
 # backend/app/routers/agents.py
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 from ..services import orchestrator
 from ..services import agent_service
 
 router = APIRouter()
 
+# Static capability descriptions, shared read-only across requests
+_CAPABILITIES = MappingProxyType({
+    "triage": "Initial assessment and routing",
+    "cardiology": "Heart and cardiovascular conditions",
+    "neurology": "Brain, nerve, and neurological conditions",
+    "gastroenterology": "Digestive system conditions",
+    "financial": "Treatment cost analysis and financial risk",
+    "coordinator": "Synthesis and unified recommendations"
+})
+
 
 class MultiAgentDiagnosisRequest(BaseModel):
     description: str
@@ -48,14 +59,7 @@ async def list_specialists():
     return {
         "specialists": specialists,
         "count": len(specialists),
-        "capabilities": {
-            "triage": "Initial assessment and routing",
-            "cardiology": "Heart and cardiovascular conditions",
-            "neurology": "Brain, nerve, and neurological conditions",
-            "gastroenterology": "Digestive system conditions",
-            "financial": "Treatment cost analysis and financial risk",
-            "coordinator": "Synthesis and unified recommendations"
-        }
+        "capabilities": _CAPABILITIES
     }
 
 
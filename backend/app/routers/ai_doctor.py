@@ -1,8 +1,8 @@
 # backend/app/routers/ai_doctor.py
 from fastapi import APIRouter, HTTPException, UploadFile, File
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, List
+from typing import AsyncIterator, Optional, Dict, List
 from app.services import ai_doctor_service, elevenlabs_service
 
 router = APIRouter()
@@ -75,6 +75,36 @@ async def continue_consultation(request: ConsultationContinueRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/continue/stream")
+async def continue_consultation_stream(request: ConsultationContinueRequest):
+    """
+    Continue an existing AI doctor consultation, streaming the reply
+
+    Same as /continue, but the AI doctor's message arrives as Server-Sent
+    Events while it is generated, followed by a final "done" event
+    """
+    chunks = await ai_doctor_service.stream_consultation(
+        session_id=request.session_id,
+        user_message=request.message,
+        tier=request.tier
+    )
+    if chunks is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+    return StreamingResponse(
+        _sse_events(chunks),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+async def _sse_events(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    async for text in chunks:
+        # Multi-line chunks need one data field per line
+        yield "".join(f"data: {line}\n" for line in text.split("\n")) + "\n"
+    yield "event: done\ndata: \n\n"
+
+
 @router.post("/summary")
 async def get_consultation_summary(request: ConsultationSummaryRequest):
     """
@@ -176,12 +206,9 @@ async def voice_question(
     Track: ElevenLabs (MLH) - Voice-enabled medical consultation
     """
     try:
-        # Read audio file
-        audio_data = await audio.read()
-
-        # Transcribe using ElevenLabs
+        # Transcribe using ElevenLabs, streaming the spooled upload
         transcription = await elevenlabs_service.transcribe_audio(
-            audio_data=audio_data,
+            audio_data=audio.file,
             filename=audio.filename
         )
 
@@ -285,12 +312,9 @@ async def full_voice_consultation(
     Track: ElevenLabs (MLH) - Full voice-to-voice medical consultation
     """
     try:
-        # Read audio file
-        audio_data = await audio.read()
-
-        # Transcribe using ElevenLabs
+        # Transcribe using ElevenLabs, streaming the spooled upload
         transcription = await elevenlabs_service.transcribe_audio(
-            audio_data=audio_data,
+            audio_data=audio.file,
             filename=audio.filename
         )
 
@@ -1,13 +1,129 @@
 # backend/app/routers/financial.py
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+import re
+import orjson
+from functools import lru_cache
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any
 from ..services import knot_service
+from ..utils.cache import cache_get, cache_set, cached, make_key
+from ..utils.http_cache import cacheable_json, private_json
 
 router = APIRouter()
 
+PREMIUM_TIER_COST = 35  # USD per AI doctor premium consultation
+AI_VS_HUMAN_CACHE_TTL_SECONDS = 3600
+
+# Fixed parts of the ai-vs-human comparison, shared across requests
+AI_DOCTOR_OPTION = {
+    "name": "AI Doctor Consultation",
+    "tiers": [
+        {
+            "tier": "Free",
+            "cost": 0,
+            "currency": "USD",
+            "features": [
+                "Instant results",
+                "24/7 Available",
+                "Based on symptom twin data",
+                "General guidance",
+                "Unlimited questions"
+            ],
+            "limitations": [
+                "No detailed treatment plans",
+                "General recommendations only"
+            ]
+        },
+        {
+            "tier": "Premium",
+            "cost": PREMIUM_TIER_COST,
+            "currency": "USD",
+            "features": [
+                "Instant results",
+                "24/7 Available",
+                "Based on symptom twin data",
+                "Detailed analysis",
+                "Personalized treatment suggestions",
+                "Follow-up recommendations"
+            ],
+            "limitations": []
+        }
+    ],
+    "time_to_consultation": "Instant",
+    "availability": "24/7",
+    "follow_up_cost": 0
+}
+
+HUMAN_DOCTOR_FEATURES = [
+    "In-person physical exam",
+    "Professional medical diagnosis",
+    "Prescription authority",
+    "Insurance accepted",
+    "Specialist referrals"
+]
+
+HUMAN_DOCTOR_LIMITATIONS = [
+    "Wait time: 2-7 days",
+    "Limited availability",
+    "Office hours only",
+    "Travel required"
+]
+
+# Everything in the comparison response up to the per-request fields,
+# serialized once: {"success":true,"comparison":{"ai_doctor":{...},
+_AI_VS_HUMAN_PREFIX = (
+    b'{"success":true,"comparison":{"ai_doctor":' + orjson.dumps(AI_DOCTOR_OPTION) + b","
+)
+
+# Condition-specific cost adjustments, in match priority order
+CONDITION_MULTIPLIERS = {
+    "neurology": 1.5,
+    "cardiology": 1.4,
+    "dermatology": 0.9,
+    "general": 1.0,
+    "urgent care": 0.7
+}
+
+# Anchored alternation of lookaheads: the first keyword (in dict order) found
+# anywhere in the condition wins, same as scanning the dict in a loop
+_CONDITION_RE = re.compile(
+    "|".join(f".*?({re.escape(key)})" for key in CONDITION_MULTIPLIERS),
+    re.IGNORECASE | re.DOTALL
+)
+
+# Emergency/serious conditions and chronic/manageable conditions
+_SERIOUS_RE = re.compile("emergency|severe|acute|trauma|chest pain|stroke")
+_CHRONIC_RE = re.compile("chronic|management|follow-up|monitoring")
+
+# Fixed recommendations by use case (cost_conscious is built per request)
+RECOMMENDATIONS = {
+    "general_inquiry": {
+        "suggestion": "ai_first",
+        "reasoning": "Start with free AI consultation to understand your symptoms. Escalate to human doctor if needed.",
+        "use_case": "general_inquiry"
+    },
+    "emergency": {
+        "suggestion": "human_doctor",
+        "reasoning": "This condition requires immediate professional medical evaluation and in-person examination.",
+        "use_case": "emergency"
+    },
+    "chronic_management": {
+        "suggestion": "hybrid",
+        "reasoning": "Use AI doctor for ongoing monitoring and questions. Schedule human doctor for periodic check-ups.",
+        "use_case": "chronic_management"
+    },
+    "balanced_approach": {
+        "suggestion": "hybrid",
+        "reasoning": "Get instant AI analysis for preliminary assessment, then book human doctor if symptoms persist.",
+        "use_case": "balanced_approach"
+    }
+}
+
 
 class FinancialRiskRequest(BaseModel):
+    # Immutable, closed body: rejects unknown keys and skips setattr validation
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     monthly_income: float
     existing_medical_debt: float = 0
     estimated_treatment_cost: float
@@ -42,13 +158,19 @@ async def assess_financial_risk(request: FinancialRiskRequest):
 
 
 @router.get("/treatment-cost/{condition}/{treatment}")
-async def get_treatment_cost(condition: str, treatment: str):
-    cost_estimate = await knot_service.estimate_treatment_cost(condition, treatment)
-    return cost_estimate
+async def get_treatment_cost(condition: str, treatment: str, request: Request):
+    cost_estimate = await _estimate_treatment_cost(condition, treatment)
+    return cacheable_json(request, orjson.dumps(cost_estimate), max_age=86400)
+
+
+@cached("treatment-cost", ttl=86400)
+async def _estimate_treatment_cost(condition: str, treatment: str) -> Dict:
+    return await knot_service.estimate_treatment_cost(condition, treatment)
 
 
 @router.get("/ai-vs-human-comparison")
 async def get_ai_vs_human_cost_comparison(
+    request: Request,
     condition: Optional[str] = None,
     user_id: Optional[str] = None
 ):
@@ -62,8 +184,33 @@ async def get_ai_vs_human_cost_comparison(
     - Time to consultation comparison
     - Feature comparison
     """
+    comparison = await _build_cost_comparison(condition=condition, user_id=user_id)
+
+    # Splice the per-request fields into the pre-serialized response prefix
+    body = _AI_VS_HUMAN_PREFIX + orjson.dumps(comparison)[1:] + b"}"
+
+    # Spending-based comparisons are per user; keep them out of shared caches
+    if user_id:
+        return private_json(body)
+    return cacheable_json(request, body, max_age=3600)
+
+
+async def _build_cost_comparison(condition: Optional[str], user_id: Optional[str]) -> Dict:
+    """
+    Per-request part of the ai-vs-human comparison (human doctor costs,
+    savings, recommendation)
+
+    Cached for an hour, except when the spending lookup failed: that result
+    uses the default cost and shouldn't outlive the outage
+    """
+    key = make_key("ai-vs-human", condition=condition, user_id=user_id)
+    hit = await cache_get(key)
+    if hit is not None:
+        return hit
+
     # Get user's average doctor visit cost if user_id provided
     avg_human_cost = 200  # default
+    lookup_failed = False
     if user_id:
         try:
             summary = await knot_service.get_spending_summary(user_id)
@@ -71,109 +218,59 @@ async def get_ai_vs_human_cost_comparison(
                 visits = summary["categories"]["doctor_visits"]
                 if visits["count"] > 0:
                     avg_human_cost = visits["total"] / visits["count"]
-        except:
-            pass
-
-    # Condition-specific cost adjustments
-    condition_multipliers = {
-        "neurology": 1.5,
-        "cardiology": 1.4,
-        "dermatology": 0.9,
-        "general": 1.0,
-        "urgent care": 0.7
-    }
+        except Exception as e:
+            # Fall back to the default cost, but don't swallow cancellation
+            print(f"Spending summary unavailable for comparison: {e}")
+            lookup_failed = True
 
     multiplier = 1.0
     if condition:
-        condition_lower = condition.lower()
-        for key, mult in condition_multipliers.items():
-            if key in condition_lower:
-                multiplier = mult
-                break
+        match = _CONDITION_RE.match(condition)
+        if match:
+            multiplier = CONDITION_MULTIPLIERS[match.group(match.lastindex).lower()]
 
     human_cost_low = int(150 * multiplier)
     human_cost_high = int(300 * multiplier)
     avg_human = int(avg_human_cost * multiplier)
 
-    return {
-        "success": True,
-        "comparison": {
-            "ai_doctor": {
-                "name": "AI Doctor Consultation",
-                "tiers": [
-                    {
-                        "tier": "Free",
-                        "cost": 0,
-                        "currency": "USD",
-                        "features": [
-                            "Instant results",
-                            "24/7 Available",
-                            "Based on symptom twin data",
-                            "General guidance",
-                            "Unlimited questions"
-                        ],
-                        "limitations": [
-                            "No detailed treatment plans",
-                            "General recommendations only"
-                        ]
-                    },
-                    {
-                        "tier": "Premium",
-                        "cost": 35,
-                        "currency": "USD",
-                        "features": [
-                            "Instant results",
-                            "24/7 Available",
-                            "Based on symptom twin data",
-                            "Detailed analysis",
-                            "Personalized treatment suggestions",
-                            "Follow-up recommendations"
-                        ],
-                        "limitations": []
-                    }
-                ],
-                "time_to_consultation": "Instant",
-                "availability": "24/7",
-                "follow_up_cost": 0
-            },
-            "human_doctor": {
-                "name": "Human Doctor Visit",
-                "cost_range": {
-                    "low": human_cost_low,
-                    "high": human_cost_high,
-                    "average": avg_human,
-                    "currency": "USD"
-                },
-                "features": [
-                    "In-person physical exam",
-                    "Professional medical diagnosis",
-                    "Prescription authority",
-                    "Insurance accepted",
-                    "Specialist referrals"
-                ],
-                "limitations": [
-                    "Wait time: 2-7 days",
-                    "Limited availability",
-                    "Office hours only",
-                    "Travel required"
-                ],
-                "time_to_consultation": "2-7 days",
-                "availability": "Business hours",
-                "follow_up_cost": avg_human
+    comparison = {
+        "human_doctor": {
+            "name": "Human Doctor Visit",
+            "cost_range": {
+                "low": human_cost_low,
+                "high": human_cost_high,
+                "average": avg_human,
+                "currency": "USD"
             },
-            "savings": {
-                "free_tier": {
-                    "min_savings": human_cost_low,
-                    "max_savings": human_cost_high,
-                    "avg_savings": avg_human
-                },
-                "premium_tier": {
-                    "min_savings": human_cost_low - 35,
-                    "max_savings": human_cost_high - 35,
-                    "avg_savings": avg_human - 35
-                }
-            },
-            "recommendation": _get_recommendation(condition, avg_human)
+            "features": HUMAN_DOCTOR_FEATURES,
+            "limitations": HUMAN_DOCTOR_LIMITATIONS,
+            "time_to_consultation": "2-7 days",
+            "availability": "Business hours",
+            "follow_up_cost": avg_human
+        },
+        "savings": _build_savings(human_cost_low, human_cost_high, avg_human),
+        "recommendation": _get_recommendation(condition, avg_human)
+    }
+
+    if not lookup_failed:
+        await cache_set(key, comparison, AI_VS_HUMAN_CACHE_TTL_SECONDS)
+    return comparison
+
+
+def _build_savings(human_cost_low: int, human_cost_high: int, avg_human: int) -> Dict:
+    """
+    Savings vs a human doctor visit for each AI doctor tier
+    """
+    return {
+        "free_tier": {
+            "min_savings": human_cost_low,
+            "max_savings": human_cost_high,
+            "avg_savings": avg_human
+        },
+        "premium_tier": {
+            "min_savings": human_cost_low - PREMIUM_TIER_COST,
+            "max_savings": human_cost_high - PREMIUM_TIER_COST,
+            "avg_savings": avg_human - PREMIUM_TIER_COST
         }
     }
 
@@ -183,43 +280,36 @@ def _get_recommendation(condition: Optional[str], avg_cost: float) -> Dict:
     Generate personalized recommendation based on condition and cost
     """
     if not condition:
+        return RECOMMENDATIONS["general_inquiry"]
+
+    use_case = _recommendation_use_case(condition.lower(), avg_cost > 250)
+
+    # High cost situations - recommend AI first
+    if use_case == "cost_conscious":
         return {
             "suggestion": "ai_first",
-            "reasoning": "Start with free AI consultation to understand your symptoms. Escalate to human doctor if needed.",
-            "use_case": "general_inquiry"
+            "reasoning": f"Save ${avg_cost - PREMIUM_TIER_COST} by starting with AI consultation. Escalate to human doctor if needed.",
+            "use_case": "cost_conscious"
         }
 
-    condition_lower = condition.lower() if condition else ""
+    return RECOMMENDATIONS[use_case]
 
+
+@lru_cache(maxsize=512)
+def _recommendation_use_case(condition_lower: str, high_cost: bool) -> str:
+    """
+    Classify a condition into a recommendation use case (pure, so memoized)
+    """
     # Emergency/serious conditions - recommend human doctor
-    serious_keywords = ["emergency", "severe", "acute", "trauma", "chest pain", "stroke"]
-    if any(keyword in condition_lower for keyword in serious_keywords):
-        return {
-            "suggestion": "human_doctor",
-            "reasoning": "This condition requires immediate professional medical evaluation and in-person examination.",
-            "use_case": "emergency"
-        }
+    if _SERIOUS_RE.search(condition_lower):
+        return "emergency"
 
     # Chronic/manageable conditions - hybrid approach
-    chronic_keywords = ["chronic", "management", "follow-up", "monitoring"]
-    if any(keyword in condition_lower for keyword in chronic_keywords):
-        return {
-            "suggestion": "hybrid",
-            "reasoning": "Use AI doctor for ongoing monitoring and questions. Schedule human doctor for periodic check-ups.",
-            "use_case": "chronic_management"
-        }
+    if _CHRONIC_RE.search(condition_lower):
+        return "chronic_management"
 
-    # High cost situations - recommend AI first
-    if avg_cost > 250:
-        return {
-            "suggestion": "ai_first",
-            "reasoning": f"Save ${avg_cost - 35} by starting with AI consultation. Escalate to human doctor if needed.",
-            "use_case": "cost_conscious"
-        }
+    if high_cost:
+        return "cost_conscious"
 
     # Default - hybrid approach
-    return {
-        "suggestion": "hybrid",
-        "reasoning": "Get instant AI analysis for preliminary assessment, then book human doctor if symptoms persist.",
-        "use_case": "balanced_approach"
-    }
+    return "balanced_approach"
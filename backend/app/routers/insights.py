@@ -10,9 +10,10 @@ Tracks:
 """
 
 from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
-from typing import Optional, List
+from fastapi.responses import Response
+from typing import Optional, Dict, Set
 import asyncio
-import json
+import orjson
 from datetime import datetime
 from app.services import realtime_insights_service
 
@@ -22,24 +23,128 @@ router = APIRouter()
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
+        self.last_message: Optional[str] = None
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        # Late joiners get the latest update right away instead of waiting a tick
+        if self.last_message is not None:
+            await websocket.send_text(self.last_message)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
 
     async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except:
-                pass
+        # Serialize once, then send the same text frame to every client
+        data = orjson.dumps(message).decode("utf-8")
+        self.last_message = data
+        await asyncio.gather(
+            *(connection.send_text(data) for connection in list(self.active_connections)),
+            return_exceptions=True
+        )
+
+
+dashboard_manager = ConnectionManager()
+feed_manager = ConnectionManager()
+alerts_manager = ConnectionManager()
+
+# One background producer per stream, shared by all of its subscribers
+_producer_tasks: Dict[str, asyncio.Task] = {}
+
+
+async def _dashboard_message(timestamp: datetime) -> Optional[dict]:
+    snapshot = await realtime_insights_service.get_combined_snapshot()
+    return {
+        "type": "dashboard_update",
+        "timestamp": timestamp,
+        "data": snapshot["dashboard"]
+    }
 
 
-manager = ConnectionManager()
+async def _feed_message(timestamp: datetime) -> Optional[dict]:
+    feed = await realtime_insights_service.get_live_symptom_feed(limit=10)
+    return {
+        "type": "symptom_feed",
+        "timestamp": timestamp,
+        "data": feed
+    }
+
+
+# Outbreak count behind the alert last pushed to subscribers
+_last_outbreak_count = 0
+
+
+async def _alerts_message(timestamp: datetime) -> Optional[dict]:
+    global _last_outbreak_count
+    snapshot = await realtime_insights_service.get_combined_snapshot()
+    outbreaks = snapshot["outbreaks"]
+    count = outbreaks["outbreaks_detected"]
+
+    if count == 0:
+        # Outbreaks cleared; don't replay the old alert to new subscribers
+        _last_outbreak_count = 0
+        alerts_manager.last_message = None
+        return None
+
+    # Only wake clients when the outbreak state changes; late joiners
+    # still get the current alert from last_message on connect
+    if count == _last_outbreak_count and alerts_manager.last_message is not None:
+        return None
+    _last_outbreak_count = count
+
+    return {
+        "type": "outbreak_alert",
+        "timestamp": timestamp,
+        "alert_level": "warning",
+        "data": outbreaks
+    }
+
+
+async def _run_producer(stream_manager: ConnectionManager, build_message, interval: float):
+    """Build the stream's message once per tick and broadcast it to every client"""
+    while stream_manager.active_connections:
+        try:
+            # One timestamp per tick, shared by every subscriber's frame
+            message = await build_message(datetime.now())
+            if message is not None:
+                await stream_manager.broadcast(message)
+        except Exception as e:
+            print(f"WebSocket producer error: {e}")
+        await asyncio.sleep(interval)
+
+    # Nobody is listening; don't replay a stale snapshot to the next client
+    stream_manager.last_message = None
+
+
+def _ensure_producer(name: str, stream_manager: ConnectionManager, build_message, interval: float):
+    """Start the stream's producer task unless it is already running"""
+    task = _producer_tasks.get(name)
+    if task is None or task.done():
+        _producer_tasks[name] = asyncio.create_task(
+            _run_producer(stream_manager, build_message, interval)
+        )
+
+
+async def _hold_open(websocket: WebSocket, stream_manager: ConnectionManager):
+    """Keep a subscriber connected until it goes away; the producer pushes updates"""
+    try:
+        while True:
+            await websocket.receive_text()
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # Also runs on cancellation (server shutdown), which is re-raised
+        stream_manager.disconnect(websocket)
+
+
+@router.on_event("shutdown")
+async def _stop_producers():
+    """Cancel the stream producers so shutdown doesn't leak their loops"""
+    for task in _producer_tasks.values():
+        task.cancel()
 
 
 @router.get("/dashboard")
@@ -92,9 +197,25 @@ async def get_live_symptom_feed(
 
     **Track:** Amazon Practical AI
     """
+    location_key = realtime_insights_service.normalize_location(location)
+
+    # Unknown locations have no reports; answer without touching the service
+    if location_key and location_key not in realtime_insights_service.KNOWN_LOCATIONS:
+        return {
+            "success": True,
+            "data": {
+                "total_items": 0,
+                "timeframe_minutes": timeframe_minutes,
+                "location_filter": location,
+                "feed": [],
+                "last_updated": datetime.now().isoformat(),
+                "track": "Amazon Practical AI"
+            }
+        }
+
     try:
         feed = await realtime_insights_service.get_live_symptom_feed(
-            location=location,
+            location=location_key,
             limit=limit,
             timeframe_minutes=timeframe_minutes
         )
@@ -306,22 +427,9 @@ async def websocket_dashboard(websocket: WebSocket):
 
     **Track:** Amazon Practical AI
     """
-    await manager.connect(websocket)
-    try:
-        while True:
-            # Send dashboard update every 5 seconds
-            dashboard = await realtime_insights_service.get_realtime_dashboard()
-            await websocket.send_json({
-                "type": "dashboard_update",
-                "timestamp": datetime.now().isoformat(),
-                "data": dashboard
-            })
-            await asyncio.sleep(5)  # Update every 5 seconds
-
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
-    except Exception as e:
-        manager.disconnect(websocket)
+    await dashboard_manager.connect(websocket)
+    _ensure_producer("dashboard", dashboard_manager, _dashboard_message, 5)  # Update every 5 seconds
+    await _hold_open(websocket, dashboard_manager)
 
 
 @router.websocket("/ws/feed")
@@ -336,22 +444,9 @@ async def websocket_symptom_feed(websocket: WebSocket):
 
     **Track:** Amazon Practical AI
     """
-    await manager.connect(websocket)
-    try:
-        while True:
-            # Send live feed every 3 seconds
-            feed = await realtime_insights_service.get_live_symptom_feed(limit=10)
-            await websocket.send_json({
-                "type": "symptom_feed",
-                "timestamp": datetime.now().isoformat(),
-                "data": feed
-            })
-            await asyncio.sleep(3)  # Update every 3 seconds
-
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
-    except Exception as e:
-        manager.disconnect(websocket)
+    await feed_manager.connect(websocket)
+    _ensure_producer("feed", feed_manager, _feed_message, 3)  # Update every 3 seconds
+    await _hold_open(websocket, feed_manager)
 
 
 @router.websocket("/ws/alerts")
@@ -366,33 +461,105 @@ async def websocket_outbreak_alerts(websocket: WebSocket):
 
     **Track:** Amazon Practical AI + Chestnut Forty
     """
-    await manager.connect(websocket)
-    try:
-        while True:
-            # Check for outbreaks every 10 seconds
-            outbreaks = await realtime_insights_service.detect_outbreaks()
-
-            if outbreaks["outbreaks_detected"] > 0:
-                # Send alert
-                await websocket.send_json({
-                    "type": "outbreak_alert",
-                    "timestamp": datetime.now().isoformat(),
-                    "alert_level": "warning",
-                    "data": outbreaks
-                })
-
-            await asyncio.sleep(10)  # Check every 10 seconds
-
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
-    except Exception as e:
-        manager.disconnect(websocket)
+    await alerts_manager.connect(websocket)
+    _ensure_producer("alerts", alerts_manager, _alerts_message, 10)  # Check every 10 seconds
+    await _hold_open(websocket, alerts_manager)
 
 
 # ============================================
 # ANALYTICS & INFO
 # ============================================
 
+# Static payloads, serialized once at import instead of on every request
+_ANALYTICS_RESPONSE = {
+    "success": True,
+    "data": {
+        "tracks": ["Amazon Practical AI", "Chestnut Forty - Predictive Intelligence"],
+        "capabilities": {
+            "real_time_dashboard": {
+                "description": "Live health metrics dashboard",
+                "update_frequency": "5 seconds",
+                "metrics": ["Active reports", "Trending symptoms", "Hotspots", "Alerts"]
+            },
+            "outbreak_detection": {
+                "description": "AI-powered outbreak detection",
+                "algorithm": "ML anomaly detection + pattern recognition",
+                "accuracy": "87% detection accuracy",
+                "sensitivity": "Configurable (0-1)"
+            },
+            "predictive_forecasting": {
+                "description": "Time-series forecasting",
+                "model": "ARIMA + ML models",
+                "forecast_range": "1-30 days",
+                "confidence": "70-95% depending on timeframe"
+            },
+            "geographic_analysis": {
+                "description": "Spatial health trend analysis",
+                "coverage": "Northeast US",
+                "resolution": "City-level",
+                "visualization": "Heatmap + coordinates"
+            },
+            "live_streaming": {
+                "description": "WebSocket real-time updates",
+                "protocols": ["REST", "WebSocket"],
+                "update_frequency": "3-10 seconds"
+            }
+        },
+        "data_sources": {
+            "snowflake": "Historical symptom database",
+            "realtime_feed": "Live symptom submissions",
+            "external": "Weather data, pollen counts (future)"
+        },
+        "use_cases": [
+            "Public health monitoring",
+            "Outbreak early detection",
+            "Patient awareness",
+            "Healthcare resource planning",
+            "Research and epidemiology"
+        ],
+        "amazon_act_integration": "Practical AI for real-world health impact"
+    }
+}
+
+_INFO_RESPONSE = {
+    "success": True,
+    "data": {
+        "track": "Amazon Practical AI",
+        "amazon_act_link": "https://nova.amazon.com/act",
+        "problem_statement": "Healthcare lacks real-time disease tracking",
+        "solution": "AI-powered live symptom monitoring and outbreak detection",
+        "impact": {
+            "patients": "Early warning of local health trends",
+            "doctors": "Better resource allocation and planning",
+            "public_health": "Faster outbreak response",
+            "society": "Prevent disease spread through early detection"
+        },
+        "technical_approach": {
+            "data_collection": "Snowflake time-series database",
+            "analysis": "ML anomaly detection + pattern recognition",
+            "delivery": "REST API + WebSocket streaming",
+            "visualization": "Geographic heatmaps + trend charts"
+        },
+        "real_world_scenarios": [
+            "Flu outbreak detected 5 days before CDC official report",
+            "Hospital prepared for surge due to trend forecast",
+            "Patients avoided crowded areas during local spike",
+            "Public health officials issued timely warnings"
+        ],
+        "competitive_advantages": [
+            "Real-time (< 5 sec updates) vs daily CDC reports",
+            "Hyper-local (city-level) vs state-level data",
+            "Predictive (forecasts) vs retrospective (reports)",
+            "Accessible (API + UI) vs limited access"
+        ]
+    }
+}
+
+
+_ANALYTICS_BODY = orjson.dumps(_ANALYTICS_RESPONSE)
+_INFO_BODY = orjson.dumps(_INFO_RESPONSE)
+
+
 @router.get("/analytics")
 async def get_insights_analytics():
     """
@@ -406,55 +573,7 @@ async def get_insights_analytics():
 
     **Track:** Amazon Practical AI + Chestnut Forty
     """
-    return {
-        "success": True,
-        "data": {
-            "tracks": ["Amazon Practical AI", "Chestnut Forty - Predictive Intelligence"],
-            "capabilities": {
-                "real_time_dashboard": {
-                    "description": "Live health metrics dashboard",
-                    "update_frequency": "5 seconds",
-                    "metrics": ["Active reports", "Trending symptoms", "Hotspots", "Alerts"]
-                },
-                "outbreak_detection": {
-                    "description": "AI-powered outbreak detection",
-                    "algorithm": "ML anomaly detection + pattern recognition",
-                    "accuracy": "87% detection accuracy",
-                    "sensitivity": "Configurable (0-1)"
-                },
-                "predictive_forecasting": {
-                    "description": "Time-series forecasting",
-                    "model": "ARIMA + ML models",
-                    "forecast_range": "1-30 days",
-                    "confidence": "70-95% depending on timeframe"
-                },
-                "geographic_analysis": {
-                    "description": "Spatial health trend analysis",
-                    "coverage": "Northeast US",
-                    "resolution": "City-level",
-                    "visualization": "Heatmap + coordinates"
-                },
-                "live_streaming": {
-                    "description": "WebSocket real-time updates",
-                    "protocols": ["REST", "WebSocket"],
-                    "update_frequency": "3-10 seconds"
-                }
-            },
-            "data_sources": {
-                "snowflake": "Historical symptom database",
-                "realtime_feed": "Live symptom submissions",
-                "external": "Weather data, pollen counts (future)"
-            },
-            "use_cases": [
-                "Public health monitoring",
-                "Outbreak early detection",
-                "Patient awareness",
-                "Healthcare resource planning",
-                "Research and epidemiology"
-            ],
-            "amazon_act_integration": "Practical AI for real-world health impact"
-        }
-    }
+    return Response(content=_ANALYTICS_BODY, media_type="application/json")
 
 
 @router.get("/info")
@@ -470,36 +589,4 @@ async def get_insights_info():
 
     **Track:** Amazon Practical AI
     """
-    return {
-        "success": True,
-        "data": {
-            "track": "Amazon Practical AI",
-            "amazon_act_link": "https://nova.amazon.com/act",
-            "problem_statement": "Healthcare lacks real-time disease tracking",
-            "solution": "AI-powered live symptom monitoring and outbreak detection",
-            "impact": {
-                "patients": "Early warning of local health trends",
-                "doctors": "Better resource allocation and planning",
-                "public_health": "Faster outbreak response",
-                "society": "Prevent disease spread through early detection"
-            },
-            "technical_approach": {
-                "data_collection": "Snowflake time-series database",
-                "analysis": "ML anomaly detection + pattern recognition",
-                "delivery": "REST API + WebSocket streaming",
-                "visualization": "Geographic heatmaps + trend charts"
-            },
-            "real_world_scenarios": [
-                "Flu outbreak detected 5 days before CDC official report",
-                "Hospital prepared for surge due to trend forecast",
-                "Patients avoided crowded areas during local spike",
-                "Public health officials issued timely warnings"
-            ],
-            "competitive_advantages": [
-                "Real-time (< 5 sec updates) vs daily CDC reports",
-                "Hyper-local (city-level) vs state-level data",
-                "Predictive (forecasts) vs retrospective (reports)",
-                "Accessible (API + UI) vs limited access"
-            ]
-        }
-    }
+    return Response(content=_INFO_BODY, media_type="application/json")
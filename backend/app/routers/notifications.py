@@ -14,15 +14,117 @@ Track: Amazon Practical AI
 Track: ElevenLabs MLH (Voice notifications)
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Query
+from fastapi.responses import Response
 from pydantic import BaseModel
 from typing import Optional, List, Dict
 from datetime import datetime
+import hashlib
+import orjson
 from app.services import notification_service
 from app.services.notification_service import NotificationType, NotificationPriority, NotificationChannel
+from app.utils.cache import cache_add, cache_delete, cache_get, make_key, set_local_capacity
 
 router = APIRouter()
 
+# Filter value -> NotificationType, so lookups don't go through enum construction
+_NOTIFICATION_TYPES = {t.value: t for t in NotificationType}
+
+
+# Client retries of a create request within this window return the first ack
+IDEMPOTENCY_TTL_SECONDS = 86400
+# Without Redis, idempotency keys get their own local store so cache traffic
+# elsewhere (notification lists, analyses, ...) can't evict them early
+IDEMPOTENCY_LOCAL_MAX_ENTRIES = 10_000
+set_local_capacity("notif-idempotency", IDEMPOTENCY_LOCAL_MAX_ENTRIES)
+
+
+async def _queue_notification(
+    background_tasks: BackgroundTasks,
+    request: BaseModel,
+    idempotency_key: Optional[str],
+    notification_type: NotificationType,
+    create,
+    **kwargs
+) -> Dict:
+    """
+    Acknowledge a create request right away and create the notification
+    after the response goes out
+
+    Retries carrying the same Idempotency-Key header (or, without one, the
+    same body, unless the endpoint passes its own key) get the original ack
+    back instead of a duplicate notification.
+    """
+    key = make_key(
+        "notif-idempotency",
+        request.user_id,
+        notification_type.value,
+        idempotency_key or request.model_dump(mode="json")
+    )
+    notification_id = notification_service.new_notification_id()
+    response = _queued_response(notification_id, request.user_id, notification_type)
+
+    if not await cache_add(key, response, IDEMPOTENCY_TTL_SECONDS):
+        previous = await cache_get(key)
+        if previous is not None:
+            return previous
+
+    background_tasks.add_task(
+        _create_queued,
+        key,
+        notification_type,
+        request.user_id,
+        notification_id,
+        create,
+        **kwargs
+    )
+    return response
+
+
+async def _create_queued(
+    idempotency_cache_key: str,
+    notification_type: NotificationType,
+    user_id: str,
+    notification_id: str,
+    create,
+    /,
+    **kwargs
+):
+    """
+    Background half of _queue_notification: a create that fails shows up
+    as a failed notification in the user's list, and its idempotency key
+    is released so a retry can create it again
+    """
+    try:
+        await create(**kwargs, notification_id=notification_id)
+    except Exception as e:
+        print(f"Queued {notification_type.value} notification failed: {e}")
+        await notification_service.mark_notification_failed(
+            user_id, notification_id, notification_type, str(e)
+        )
+        await cache_delete(idempotency_cache_key)
+
+
+def _local_naive(value: datetime) -> datetime:
+    """Timezone-aware request datetimes as naive local time, like the service's datetime.now()"""
+    if value.tzinfo:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _queued_response(notification_id: str, user_id: str, notification_type: NotificationType) -> Dict:
+    """Ack for a notification that is created in a background task"""
+    return {
+        "success": True,
+        "queued": True,
+        "data": {
+            "notification_id": notification_id,
+            "user_id": user_id,
+            "type": notification_type.value,
+            "status": "queued"
+        }
+    }
+
 
 class MedicationReminderRequest(BaseModel):
     user_id: str
@@ -87,7 +189,11 @@ class BulkOutbreakAlertRequest(BaseModel):
 
 
 @router.post("/medication-reminder")
-async def create_medication_reminder(request: MedicationReminderRequest):
+async def create_medication_reminder(
+    request: MedicationReminderRequest,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
     Create medication reminder
 
@@ -103,26 +209,33 @@ async def create_medication_reminder(request: MedicationReminderRequest):
     - "Take 500mg Ibuprofen" at 9:00 AM daily
     - Optional voice call reminder
     """
-    try:
-        result = await notification_service.create_medication_reminder(
-            user_id=request.user_id,
-            medication_name=request.medication_name,
-            dosage=request.dosage,
-            time=request.time,
-            frequency=request.frequency,
-            voice_enabled=request.voice_enabled
-        )
-
-        return {
-            "success": True,
-            "data": result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Without a header, one reminder per (user, medication, time) - a
+    # re-submit with a tweaked dosage is still the same reminder
+    if idempotency_key is None:
+        identity = f"{request.user_id}|{request.medication_name}|{request.time}"
+        idempotency_key = hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+    return await _queue_notification(
+        background_tasks,
+        request,
+        idempotency_key,
+        NotificationType.MEDICATION_REMINDER,
+        notification_service.create_medication_reminder,
+        user_id=request.user_id,
+        medication_name=request.medication_name,
+        dosage=request.dosage,
+        time=request.time,
+        frequency=request.frequency,
+        voice_enabled=request.voice_enabled
+    )
 
 
 @router.post("/appointment-reminder")
-async def create_appointment_reminder(request: AppointmentReminderRequest):
+async def create_appointment_reminder(
+    request: AppointmentReminderRequest,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
     Create appointment reminder
 
@@ -139,26 +252,27 @@ async def create_appointment_reminder(request: AppointmentReminderRequest):
     - Saves healthcare system costs
     - Better patient outcomes
     """
-    try:
-        result = await notification_service.create_appointment_reminder(
-            user_id=request.user_id,
-            appointment_id=request.appointment_id,
-            doctor_name=request.doctor_name,
-            appointment_time=request.appointment_time,
-            location=request.location,
-            reminder_hours_before=request.reminder_hours_before
-        )
-
-        return {
-            "success": True,
-            "data": result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _queue_notification(
+        background_tasks,
+        request,
+        idempotency_key,
+        NotificationType.APPOINTMENT_REMINDER,
+        notification_service.create_appointment_reminder,
+        user_id=request.user_id,
+        appointment_id=request.appointment_id,
+        doctor_name=request.doctor_name,
+        appointment_time=_local_naive(request.appointment_time),
+        location=request.location,
+        reminder_hours_before=request.reminder_hours_before
+    )
 
 
 @router.post("/symptom-checkin")
-async def create_symptom_checkin(request: SymptomCheckinRequest):
+async def create_symptom_checkin(
+    request: SymptomCheckinRequest,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
     Create symptom check-in reminder
 
@@ -175,23 +289,24 @@ async def create_symptom_checkin(request: SymptomCheckinRequest):
     - Track if treatment is working
     - Escalate to doctor if no improvement
     """
-    try:
-        result = await notification_service.create_symptom_checkin(
-            user_id=request.user_id,
-            condition=request.condition,
-            last_checkin_days_ago=request.last_checkin_days_ago
-        )
-
-        return {
-            "success": True,
-            "data": result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _queue_notification(
+        background_tasks,
+        request,
+        idempotency_key,
+        NotificationType.SYMPTOM_CHECKIN,
+        notification_service.create_symptom_checkin,
+        user_id=request.user_id,
+        condition=request.condition,
+        last_checkin_days_ago=request.last_checkin_days_ago
+    )
 
 
 @router.post("/outbreak-alert")
-async def create_outbreak_alert(request: OutbreakAlertRequest):
+async def create_outbreak_alert(
+    request: OutbreakAlertRequest,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
     Create outbreak alert notification
 
@@ -207,26 +322,27 @@ async def create_outbreak_alert(request: OutbreakAlertRequest):
     "⚠️ Flu Alert in Boston - 450 cases (moderate severity)"
     Recommendations: Get flu shot, practice hygiene, avoid crowds
     """
-    try:
-        result = await notification_service.create_outbreak_alert(
-            user_id=request.user_id,
-            condition=request.condition,
-            location=request.location,
-            severity=request.severity,
-            case_count=request.case_count,
-            recommendations=request.recommendations
-        )
-
-        return {
-            "success": True,
-            "data": result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _queue_notification(
+        background_tasks,
+        request,
+        idempotency_key,
+        NotificationType.OUTBREAK_ALERT,
+        notification_service.create_outbreak_alert,
+        user_id=request.user_id,
+        condition=request.condition,
+        location=request.location,
+        severity=request.severity,
+        case_count=request.case_count,
+        recommendations=request.recommendations
+    )
 
 
 @router.post("/followup-reminder")
-async def create_followup_reminder(request: FollowupReminderRequest):
+async def create_followup_reminder(
+    request: FollowupReminderRequest,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
     Create follow-up care reminder
 
@@ -242,20 +358,17 @@ async def create_followup_reminder(request: FollowupReminderRequest):
     7 days after starting antibiotics for strep throat:
     "How's your strep throat? Symptoms should be improving by now."
     """
-    try:
-        result = await notification_service.create_followup_reminder(
-            user_id=request.user_id,
-            condition=request.condition,
-            treatment_started=request.treatment_started,
-            expected_improvement_days=request.expected_improvement_days
-        )
-
-        return {
-            "success": True,
-            "data": result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _queue_notification(
+        background_tasks,
+        request,
+        idempotency_key,
+        NotificationType.FOLLOWUP_CARE,
+        notification_service.create_followup_reminder,
+        user_id=request.user_id,
+        condition=request.condition,
+        treatment_started=_local_naive(request.treatment_started),
+        expected_improvement_days=request.expected_improvement_days
+    )
 
 
 @router.get("/user/{user_id}")
@@ -263,43 +376,41 @@ async def get_user_notifications(
     user_id: str,
     notification_type: Optional[str] = Query(None, description="Filter by type"),
     status: Optional[str] = Query(None, description="Filter by status (scheduled, sent, read)"),
-    limit: int = Query(50, description="Max notifications to return")
+    limit: int = Query(50, description="Max notifications to return"),
+    days: int = Query(30, description="Only notifications created in the last N days"),
+    before: Optional[datetime] = Query(None, description="Load more: only notifications created before this time")
 ):
     """
     Get user's notifications
 
     **Notification center:**
-    - All user notifications
+    - Recent user notifications (last 30 days by default)
     - Filter by type or status
     - Unread count
     - Sorted by most recent
 
     **Track:** Amazon Practical AI
     """
-    try:
-        # Convert string to enum if provided
-        notif_type = None
-        if notification_type:
-            try:
-                notif_type = NotificationType(notification_type)
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Invalid notification type: {notification_type}")
-
-        result = await notification_service.get_user_notifications(
-            user_id=user_id,
-            notification_type=notif_type,
-            status=status,
-            limit=limit
-        )
+    # Convert string to enum if provided
+    notif_type = None
+    if notification_type:
+        notif_type = _NOTIFICATION_TYPES.get(notification_type)
+        if notif_type is None:
+            raise HTTPException(status_code=400, detail=f"Invalid notification type: {notification_type}")
+
+    result = await notification_service.get_user_notifications(
+        user_id=user_id,
+        notification_type=notif_type,
+        status=status,
+        limit=limit,
+        days=days,
+        before=before
+    )
 
-        return {
-            "success": True,
-            "data": result
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "success": True,
+        "data": result
+    }
 
 
 @router.post("/mark-read")
@@ -309,20 +420,15 @@ async def mark_notification_read(user_id: str, notification_id: str):
 
     **Track:** Amazon Practical AI
     """
-    try:
-        result = await notification_service.mark_notification_read(user_id, notification_id)
+    result = await notification_service.mark_notification_read(user_id, notification_id)
 
-        if not result.get("success"):
-            raise HTTPException(status_code=404, detail=result.get("error"))
+    if not result.get("success"):
+        raise HTTPException(status_code=404, detail=result.get("error"))
 
-        return {
-            "success": True,
-            "data": result
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "success": True,
+        "data": result
+    }
 
 
 @router.post("/dismiss")
@@ -332,20 +438,15 @@ async def dismiss_notification(user_id: str, notification_id: str):
 
     **Track:** Amazon Practical AI
     """
-    try:
-        result = await notification_service.dismiss_notification(user_id, notification_id)
+    result = await notification_service.dismiss_notification(user_id, notification_id)
 
-        if not result.get("success"):
-            raise HTTPException(status_code=404, detail=result.get("error"))
+    if not result.get("success"):
+        raise HTTPException(status_code=404, detail=result.get("error"))
 
-        return {
-            "success": True,
-            "data": result
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "success": True,
+        "data": result
+    }
 
 
 @router.post("/preferences")
@@ -361,31 +462,17 @@ async def set_notification_preferences(request: NotificationPreferencesRequest):
 
     **Track:** Amazon Practical AI + ElevenLabs MLH
     """
-    try:
-        preferences = {
-            "medication_reminders": request.medication_reminders,
-            "appointment_reminders": request.appointment_reminders,
-            "symptom_checkins": request.symptom_checkins,
-            "outbreak_alerts": request.outbreak_alerts,
-            "followup_reminders": request.followup_reminders,
-            "health_tips": request.health_tips,
-            "voice_notifications": request.voice_notifications,
-            "quiet_hours_start": request.quiet_hours_start,
-            "quiet_hours_end": request.quiet_hours_end,
-            "preferred_channels": request.preferred_channels
-        }
+    preferences = request.model_dump(exclude={"user_id"})
 
-        result = await notification_service.set_notification_preferences(
-            user_id=request.user_id,
-            preferences=preferences
-        )
+    result = await notification_service.set_notification_preferences(
+        user_id=request.user_id,
+        preferences=preferences
+    )
 
-        return {
-            "success": True,
-            "data": result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "success": True,
+        "data": result
+    }
 
 
 @router.get("/preferences/{user_id}")
@@ -395,15 +482,12 @@ async def get_notification_preferences(user_id: str):
 
     **Track:** Amazon Practical AI
     """
-    try:
-        result = await notification_service.get_notification_preferences(user_id)
+    result = await notification_service.get_notification_preferences(user_id)
 
-        return {
-            "success": True,
-            "data": result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "success": True,
+        "data": result
+    }
 
 
 @router.post("/bulk-outbreak-alert")
@@ -423,21 +507,18 @@ async def send_bulk_outbreak_alerts(request: BulkOutbreakAlertRequest):
     Flu outbreak detected in Boston → Alert 10,000 Boston users
     "⚠️ Flu cases up 42% - take precautions"
     """
-    try:
-        result = await notification_service.send_bulk_outbreak_alerts(
-            condition=request.condition,
-            location=request.location,
-            severity=request.severity,
-            case_count=request.case_count,
-            affected_user_ids=request.affected_user_ids
-        )
+    result = await notification_service.send_bulk_outbreak_alerts(
+        condition=request.condition,
+        location=request.location,
+        severity=request.severity,
+        case_count=request.case_count,
+        affected_user_ids=request.affected_user_ids
+    )
 
-        return {
-            "success": True,
-            "data": result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "success": True,
+        "data": result
+    }
 
 
 # ============================================
@@ -458,15 +539,83 @@ async def get_notification_analytics():
 
     **Track:** Amazon Practical AI
     """
-    try:
-        analytics = await notification_service.get_notification_analytics()
+    analytics = await notification_service.get_notification_analytics()
+
+    return {
+        "success": True,
+        "data": analytics
+    }
 
-        return {
-            "success": True,
-            "data": analytics
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+# Static payload, serialized once at import instead of on every request
+_INFO_RESPONSE = {
+    "success": True,
+    "data": {
+        "track": "Amazon Practical AI",
+        "problem_statement": "Patients miss medications, appointments, and follow-ups leading to worse outcomes",
+        "solution": "Smart AI-powered notification system with voice support",
+        "impact": {
+            "medication_adherence": "+45% improvement with reminders",
+            "missed_appointments": "-67% reduction with advance reminders",
+            "treatment_success": "+32% with follow-up check-ins",
+            "outbreak_awareness": "Real-time alerts save lives"
+        },
+        "notification_types": [
+            {
+                "type": "medication_reminder",
+                "description": "Never miss a dose",
+                "channels": ["push", "voice", "in_app"],
+                "practical_impact": "Improves medication adherence by 45%"
+            },
+            {
+                "type": "appointment_reminder",
+                "description": "Reduce no-shows",
+                "channels": ["email", "push", "in_app"],
+                "practical_impact": "Reduces missed appointments by 67%"
+            },
+            {
+                "type": "symptom_checkin",
+                "description": "Track recovery progress",
+                "channels": ["push", "in_app"],
+                "practical_impact": "Early detection of treatment failure"
+            },
+            {
+                "type": "outbreak_alert",
+                "description": "Stay informed about local threats",
+                "channels": ["push", "in_app"],
+                "practical_impact": "Prevents disease spread through awareness"
+            },
+            {
+                "type": "followup_care",
+                "description": "Ensure treatment success",
+                "channels": ["push", "in_app"],
+                "practical_impact": "Increases treatment success rate by 32%"
+            }
+        ],
+        "elevenlabs_integration": {
+            "enabled": True,
+            "feature": "Voice notifications",
+            "use_case": "Call patients with medication reminders",
+            "accessibility": "Perfect for elderly or visually impaired patients",
+            "track": "ElevenLabs MLH"
+        },
+        "real_world_examples": [
+            "Elderly patient gets voice call: 'Time for your blood pressure medication'",
+            "Student gets push notification: 'Doctor appointment tomorrow at 2 PM'",
+            "Parent gets alert: 'Flu outbreak in your area - 450 cases detected'",
+            "Patient gets check-in: 'How's your migraine? Symptoms should be improving'"
+        ],
+        "competitive_advantages": [
+            "Multi-channel (push, SMS, email, voice)",
+            "AI-powered timing (respects quiet hours, user preferences)",
+            "Voice notifications for accessibility (ElevenLabs)",
+            "Real-time outbreak alerts (< 5 min after detection)",
+            "Personalized based on user health profile"
+        ]
+    }
+}
+
+_INFO_BODY = orjson.dumps(_INFO_RESPONSE)
 
 
 @router.get("/info")
@@ -483,69 +632,4 @@ async def get_notifications_info():
 
     **Track:** Amazon Practical AI + ElevenLabs MLH
     """
-    return {
-        "success": True,
-        "data": {
-            "track": "Amazon Practical AI",
-            "problem_statement": "Patients miss medications, appointments, and follow-ups leading to worse outcomes",
-            "solution": "Smart AI-powered notification system with voice support",
-            "impact": {
-                "medication_adherence": "+45% improvement with reminders",
-                "missed_appointments": "-67% reduction with advance reminders",
-                "treatment_success": "+32% with follow-up check-ins",
-                "outbreak_awareness": "Real-time alerts save lives"
-            },
-            "notification_types": [
-                {
-                    "type": "medication_reminder",
-                    "description": "Never miss a dose",
-                    "channels": ["push", "voice", "in_app"],
-                    "practical_impact": "Improves medication adherence by 45%"
-                },
-                {
-                    "type": "appointment_reminder",
-                    "description": "Reduce no-shows",
-                    "channels": ["email", "push", "in_app"],
-                    "practical_impact": "Reduces missed appointments by 67%"
-                },
-                {
-                    "type": "symptom_checkin",
-                    "description": "Track recovery progress",
-                    "channels": ["push", "in_app"],
-                    "practical_impact": "Early detection of treatment failure"
-                },
-                {
-                    "type": "outbreak_alert",
-                    "description": "Stay informed about local threats",
-                    "channels": ["push", "in_app"],
-                    "practical_impact": "Prevents disease spread through awareness"
-                },
-                {
-                    "type": "followup_care",
-                    "description": "Ensure treatment success",
-                    "channels": ["push", "in_app"],
-                    "practical_impact": "Increases treatment success rate by 32%"
-                }
-            ],
-            "elevenlabs_integration": {
-                "enabled": True,
-                "feature": "Voice notifications",
-                "use_case": "Call patients with medication reminders",
-                "accessibility": "Perfect for elderly or visually impaired patients",
-                "track": "ElevenLabs MLH"
-            },
-            "real_world_examples": [
-                "Elderly patient gets voice call: 'Time for your blood pressure medication'",
-                "Student gets push notification: 'Doctor appointment tomorrow at 2 PM'",
-                "Parent gets alert: 'Flu outbreak in your area - 450 cases detected'",
-                "Patient gets check-in: 'How's your migraine? Symptoms should be improving'"
-            ],
-            "competitive_advantages": [
-                "Multi-channel (push, SMS, email, voice)",
-                "AI-powered timing (respects quiet hours, user preferences)",
-                "Voice notifications for accessibility (ElevenLabs)",
-                "Real-time outbreak alerts (< 5 min after detection)",
-                "Personalized based on user health profile"
-            ]
-        }
-    }
+    return Response(content=_INFO_BODY, media_type="application/json")
@@ -17,10 +17,12 @@ Requirements:
 - Multi-agent collaboration ✅
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
+import orjson
 from app.services import photon_service
+from app.utils.http_cache import cacheable_json, make_etag
 
 router = APIRouter()
 
@@ -57,6 +59,14 @@ class EscalationRequest(BaseModel):
     patient_message: Optional[str] = None
 
 
+class IMessagePayload(BaseModel):
+    # Optional so a missing field keeps returning 400, not a 422
+    session_id: Optional[str] = None
+    text: Optional[str] = None
+    sender: Optional[str] = "patient"
+    message_id: Optional[Union[str, int]] = None
+
+
 @router.post("/hybrid-consultation/start")
 async def start_hybrid_consultation(request: HybridConsultationRequest):
     """
@@ -76,19 +86,16 @@ async def start_hybrid_consultation(request: HybridConsultationRequest):
     - If complex → Human doctor validates
     - Patient gets best of both worlds
     """
-    try:
-        result = await photon_service.start_hybrid_consultation(
-            patient_data=request.patient_data,
-            symptoms=request.symptoms,
-            urgency=request.urgency
-        )
-
-        return {
-            "success": True,
-            "data": result
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await photon_service.start_hybrid_consultation(
+        patient_data=request.patient_data,
+        symptoms=request.symptoms,
+        urgency=request.urgency
+    )
+
+    return {
+        "success": True,
+        "data": result
+    }
 
 
 @router.post("/hybrid-consultation/human-review")
@@ -108,28 +115,25 @@ async def submit_human_review(request: HumanReviewRequest):
     - Human: "I agree, but also check for cluster headaches given the timing"
     - Hybrid: "Migraine (confirmed) with cluster headache monitoring"
     """
-    try:
-        result = await photon_service.submit_human_review(
-            session_id=request.session_id,
-            doctor_id=request.doctor_id,
-            doctor_name=request.doctor_name,
-            review={
-                "diagnosis": request.diagnosis,
-                "confidence": request.confidence,
-                "treatment_plan": request.treatment_plan,
-                "notes": request.notes,
-                "modifications": request.modifications,
-                "follow_up_required": request.follow_up_required,
-                "next_steps": request.next_steps
-            }
-        )
-
-        return {
-            "success": True,
-            "data": result
+    result = await photon_service.submit_human_review(
+        session_id=request.session_id,
+        doctor_id=request.doctor_id,
+        doctor_name=request.doctor_name,
+        review={
+            "diagnosis": request.diagnosis,
+            "confidence": request.confidence,
+            "treatment_plan": request.treatment_plan,
+            "notes": request.notes,
+            "modifications": request.modifications,
+            "follow_up_required": request.follow_up_required,
+            "next_steps": request.next_steps
         }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    )
+
+    return {
+        "success": True,
+        "data": result
+    }
 
 
 @router.get("/hybrid-consultation/{session_id}/status")
@@ -145,20 +149,15 @@ async def get_consultation_status(session_id: str):
 
     **Track:** Photon - Hybrid Intelligence
     """
-    try:
-        status = await photon_service.get_hybrid_consultation_status(session_id)
+    status = await photon_service.get_hybrid_consultation_status(session_id)
 
-        if "error" in status:
-            raise HTTPException(status_code=404, detail=status["error"])
+    if "error" in status:
+        raise HTTPException(status_code=404, detail=status["error"])
 
-        return {
-            "success": True,
-            "data": status
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "success": True,
+        "data": status
+    }
 
 
 @router.post("/hybrid-consultation/message")
@@ -181,25 +180,20 @@ async def add_message_to_consultation(request: CollaborationMessageRequest):
     - AI: "Moderate severity, human doctor reviewing"
     - Human: "Not urgent, but let's monitor for 24h"
     """
-    try:
-        result = await photon_service.add_collaboration_message(
-            session_id=request.session_id,
-            actor=request.actor,
-            message=request.message,
-            metadata=request.metadata
-        )
-
-        if "error" in result:
-            raise HTTPException(status_code=404, detail=result["error"])
-
-        return {
-            "success": True,
-            "data": result
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await photon_service.add_collaboration_message(
+        session_id=request.session_id,
+        actor=request.actor,
+        message=request.message,
+        metadata=request.metadata
+    )
+
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+
+    return {
+        "success": True,
+        "data": result
+    }
 
 
 @router.post("/hybrid-consultation/escalate")
@@ -218,24 +212,19 @@ async def request_human_escalation(request: EscalationRequest):
 
     **Track:** Photon - Hybrid Intelligence
     """
-    try:
-        result = await photon_service.request_human_escalation(
-            session_id=request.session_id,
-            reason=request.reason,
-            patient_message=request.patient_message
-        )
-
-        if "error" in result:
-            raise HTTPException(status_code=404, detail=result["error"])
-
-        return {
-            "success": True,
-            "data": result
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await photon_service.request_human_escalation(
+        session_id=request.session_id,
+        reason=request.reason,
+        patient_message=request.patient_message
+    )
+
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+
+    return {
+        "success": True,
+        "data": result
+    }
 
 
 # ============================================
@@ -258,24 +247,22 @@ async def get_consultation_for_imessage(session_id: str):
 
     **Requirement:** Projects must integrate with iMessage Kit to qualify
     """
-    try:
-        imessage_data = await photon_service.format_for_imessage(session_id)
+    imessage_data = await photon_service.format_for_imessage(session_id)
 
-        if "error" in imessage_data:
-            raise HTTPException(status_code=404, detail=imessage_data["error"])
+    if "error" in imessage_data:
+        raise HTTPException(status_code=404, detail=imessage_data["error"])
 
-        return {
-            "success": True,
-            "data": imessage_data
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "success": True,
+        "data": imessage_data
+    }
+
+
+_IMESSAGE_QUICK_REPLIES = ("Request human doctor", "Ask AI a question", "View status")
 
 
 @router.post("/imessage/send")
-async def send_imessage(payload: Dict):
+async def send_imessage(payload: IMessagePayload):
     """
     Send message from iMessage to hybrid consultation
 
@@ -288,46 +275,122 @@ async def send_imessage(payload: Dict):
 
     **Track:** Photon - Hybrid Intelligence
     """
-    try:
-        # Extract iMessage Kit payload
-        session_id = payload.get("session_id")
-        message_text = payload.get("text")
-        sender = payload.get("sender", "patient")
-
-        if not session_id or not message_text:
-            raise HTTPException(status_code=400, detail="session_id and text required")
-
-        # Add to collaboration thread
-        result = await photon_service.add_collaboration_message(
-            session_id=session_id,
-            actor=sender,
-            message=message_text,
-            metadata={"source": "imessage", "imessage_id": payload.get("message_id")}
-        )
-
-        if "error" in result:
-            raise HTTPException(status_code=404, detail=result["error"])
-
-        return {
-            "success": True,
-            "data": result,
-            "imessage_response": {
-                "text": result.get("ai_response", "Message received"),
-                "quick_replies": ["Request human doctor", "Ask AI a question", "View status"]
-            }
+    # Extract iMessage Kit payload
+    session_id = payload.session_id
+    message_text = payload.text
+    sender = payload.sender or "patient"
+
+    if not session_id or not message_text:
+        raise HTTPException(status_code=400, detail="session_id and text required")
+
+    # Add to collaboration thread
+    result = await photon_service.add_collaboration_message(
+        session_id=session_id,
+        actor=sender,
+        message=message_text,
+        metadata={"source": "imessage", "imessage_id": payload.message_id}
+    )
+
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+
+    return {
+        "success": True,
+        "data": result,
+        "imessage_response": {
+            "text": result.get("ai_response", "Message received"),
+            "quick_replies": _IMESSAGE_QUICK_REPLIES
         }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    }
 
 
 # ============================================
 # ANALYTICS & INFO
 # ============================================
 
+# Static payloads, serialized once at import instead of on every request
+_ANALYTICS_RESPONSE = {
+    "success": True,
+    "data": {
+        "track": "Photon - Exploring Hybrid Intelligence",
+        "prize": {
+            "winner": "$1000 ($400 cash + $600 Photon credits)",
+            "runner_up": "$300 ($100 cash + $200 Photon credits)",
+            "fast_track": "Final interview with Photon team"
+        },
+        "metrics": {
+            "total_hybrid_consultations": 127,
+            "ai_only_cases": 45,
+            "human_validated_cases": 82,
+            "consensus_rate": 0.89,
+            "average_confidence": {
+                "ai_only": 0.82,
+                "human_only": 0.94,
+                "hybrid": 0.96
+            },
+            "time_saved": "78% faster than human-only",
+            "cost_saved": "$142 average per consultation"
+        },
+        "collaboration_insights": {
+            "ai_escalates_to_human": "24% of cases",
+            "patient_requests_human": "16% of cases",
+            "ai_human_consensus": "89% agreement",
+            "hybrid_confidence_boost": "+14% vs AI-only"
+        },
+        "requirements_met": {
+            "imessage_kit_integration": True,
+            "context_awareness": True,
+            "human_in_loop": True,
+            "multi_agent_system": True,
+            "real_time_collaboration": True
+        }
+    }
+}
+
+_INFO_RESPONSE = {
+    "success": True,
+    "data": {
+        "track": "Photon - Exploring Hybrid Intelligence",
+        "vision": "AI that lives alongside humans, not replaces them",
+        "implementation": {
+            "ai_agents": ["Dedalus multi-agent", "Gemini AI", "Symptom analyzer"],
+            "human_experts": "Licensed medical doctors",
+            "collaboration_model": "AI suggests → Human validates → Hybrid outcome"
+        },
+        "north_star": [
+            "Agents that feel present, not intrusive",
+            "Interfaces that disappear as intent becomes action",
+            "Systems that improve with every interaction"
+        ],
+        "real_world_benefits": {
+            "for_patients": "Instant AI analysis + Human validation = Confidence",
+            "for_doctors": "AI pre-screening saves time, focus on complex cases",
+            "for_healthcare": "Scale expertise without sacrificing quality"
+        },
+        "imessage_integration": {
+            "enabled": True,
+            "features": ["Real-time messaging", "Quick actions", "Status updates"],
+            "webhook_endpoint": "/api/photon/imessage/send"
+        },
+        "demo_flow": [
+            "1. Patient describes symptoms via iMessage",
+            "2. AI analyzes (2 seconds) → provides initial assessment",
+            "3. System determines: AI-only sufficient OR human review needed",
+            "4. If human needed → doctor validates (5-15 min)",
+            "5. Hybrid recommendation combines both insights",
+            "6. Patient receives final diagnosis with confidence scores"
+        ]
+    }
+}
+
+_ANALYTICS_BODY = orjson.dumps(_ANALYTICS_RESPONSE)
+_ANALYTICS_ETAG = make_etag(_ANALYTICS_BODY)
+_INFO_BODY = orjson.dumps(_INFO_RESPONSE)
+_INFO_ETAG = make_etag(_INFO_BODY)
+
+
 @router.get("/analytics")
-async def get_hybrid_intelligence_analytics():
+async def get_hybrid_intelligence_analytics(request: Request):
     """
     Get Photon hybrid intelligence analytics
 
@@ -340,47 +403,11 @@ async def get_hybrid_intelligence_analytics():
 
     **Track:** Photon - Hybrid Intelligence
     """
-    return {
-        "success": True,
-        "data": {
-            "track": "Photon - Exploring Hybrid Intelligence",
-            "prize": {
-                "winner": "$1000 ($400 cash + $600 Photon credits)",
-                "runner_up": "$300 ($100 cash + $200 Photon credits)",
-                "fast_track": "Final interview with Photon team"
-            },
-            "metrics": {
-                "total_hybrid_consultations": 127,
-                "ai_only_cases": 45,
-                "human_validated_cases": 82,
-                "consensus_rate": 0.89,
-                "average_confidence": {
-                    "ai_only": 0.82,
-                    "human_only": 0.94,
-                    "hybrid": 0.96
-                },
-                "time_saved": "78% faster than human-only",
-                "cost_saved": "$142 average per consultation"
-            },
-            "collaboration_insights": {
-                "ai_escalates_to_human": "24% of cases",
-                "patient_requests_human": "16% of cases",
-                "ai_human_consensus": "89% agreement",
-                "hybrid_confidence_boost": "+14% vs AI-only"
-            },
-            "requirements_met": {
-                "imessage_kit_integration": True,
-                "context_awareness": True,
-                "human_in_loop": True,
-                "multi_agent_system": True,
-                "real_time_collaboration": True
-            }
-        }
-    }
+    return cacheable_json(request, _ANALYTICS_BODY, max_age=3600, etag=_ANALYTICS_ETAG)
 
 
 @router.get("/info")
-async def get_photon_track_info():
+async def get_photon_track_info(request: Request):
     """
     Get information about Photon Hybrid Intelligence implementation
 
@@ -393,38 +420,4 @@ async def get_photon_track_info():
 
     **Track:** Photon - Exploring Hybrid Intelligence
     """
-    return {
-        "success": True,
-        "data": {
-            "track": "Photon - Exploring Hybrid Intelligence",
-            "vision": "AI that lives alongside humans, not replaces them",
-            "implementation": {
-                "ai_agents": ["Dedalus multi-agent", "Gemini AI", "Symptom analyzer"],
-                "human_experts": "Licensed medical doctors",
-                "collaboration_model": "AI suggests → Human validates → Hybrid outcome"
-            },
-            "north_star": [
-                "Agents that feel present, not intrusive",
-                "Interfaces that disappear as intent becomes action",
-                "Systems that improve with every interaction"
-            ],
-            "real_world_benefits": {
-                "for_patients": "Instant AI analysis + Human validation = Confidence",
-                "for_doctors": "AI pre-screening saves time, focus on complex cases",
-                "for_healthcare": "Scale expertise without sacrificing quality"
-            },
-            "imessage_integration": {
-                "enabled": True,
-                "features": ["Real-time messaging", "Quick actions", "Status updates"],
-                "webhook_endpoint": "/api/photon/imessage/send"
-            },
-            "demo_flow": [
-                "1. Patient describes symptoms via iMessage",
-                "2. AI analyzes (2 seconds) → provides initial assessment",
-                "3. System determines: AI-only sufficient OR human review needed",
-                "4. If human needed → doctor validates (5-15 min)",
-                "5. Hybrid recommendation combines both insights",
-                "6. Patient receives final diagnosis with confidence scores"
-            ]
-        }
-    }
+    return cacheable_json(request, _INFO_BODY, max_age=3600, etag=_INFO_ETAG)
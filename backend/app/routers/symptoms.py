@@ -1,25 +1,41 @@
 # backend/app/routers/symptoms.py
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, HTTPException, UploadFile, File, Form
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict, Any
 from ..services import vector_service
 from ..db import snowflake_client
 from ..services import ai_service
 from ..services import knot_service
 from ..services import elevenlabs_service
+from ..utils.batcher import MicroBatcher
+from ..utils.cache import cache_get, cache_set, make_key, set_local_capacity
+import asyncio
+import orjson
 import uuid
-import base64
 
 router = APIRouter()
 
-# Simple in-memory cache for analyses (in production, use Redis or database)
-ANALYSIS_CACHE: Dict[str, Dict[str, Any]] = {}
+# Analyses stay retrievable by id for an hour; in Redis when configured so
+# any worker can serve them, otherwise in their own bounded local store
+# (unrelated cache traffic can't evict them early)
+ANALYSIS_TTL_SECONDS = 3600
+ANALYSIS_LOCAL_MAX_ENTRIES = 10_000
+set_local_capacity("analysis", ANALYSIS_LOCAL_MAX_ENTRIES)
+
+MAX_IMAGE_UPLOAD_BYTES = 10 * 1024 * 1024
 
 class SymptomRequest(BaseModel):
     description: str
     # Optional patient data for better AI analysis
     patientData: Optional[Dict[str, Any]] = None
 
+class AddSymptomRequest(BaseModel):
+    description: str
+    id: Optional[str] = None
+    # condition, treatment, success_rate, ... are stored as vector metadata
+    model_config = ConfigDict(extra="allow")
+
 class SymptomMatch(BaseModel):
     id: str
     similarity: float
@@ -50,40 +66,84 @@ class EnhancedMatchResponse(BaseModel):
     treatment_costs: Optional[List[Dict[str, Any]]] = None
     financial_summary: Optional[Dict[str, Any]] = None
 
-@router.post("/match", response_model=EnhancedMatchResponse)
-async def match_symptoms(request: SymptomRequest):
+async def _matches_with_costs(symptom: str):
+    """Vector matches for a symptom plus cost estimates for the top three"""
     matches = await vector_service.query_similar_vectors(
-        symptom=request.description,
+        symptom=symptom,
         top_k=5
     )
 
     if not matches:
         matches = vector_service.generate_fake_matches()
 
-    ai_analysis = await ai_service.analyze_symptoms(
-        symptom_description=request.description,
-        patient_data=request.patientData
-    )
-
-    treatment_costs = []
-    for match in matches[:3]:
-        cost_estimate = await knot_service.estimate_treatment_cost(
+    estimates = await asyncio.gather(*(
+        knot_service.estimate_treatment_cost(
             condition=match.get("condition", "Unknown"),
             treatment=match.get("treatment", "Standard care")
         )
-        treatment_costs.append(cost_estimate)
+        for match in matches[:3]
+    ), return_exceptions=True)
+
+    # A failed estimate is left out of the costs rather than failing the match
+    treatment_costs = []
+    for estimate in estimates:
+        if isinstance(estimate, Exception):
+            print(f"Treatment cost estimate failed: {estimate}")
+        else:
+            treatment_costs.append(estimate)
+    return matches, treatment_costs
+
 
-    avg_treatment_cost = sum(c["average"] for c in treatment_costs) / len(treatment_costs) if treatment_costs else 0
-    financial_summary = {
+def _financial_summary(treatment_costs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Cost range and average coverage across estimates, in a single pass"""
+    if not treatment_costs:
+        return {
+            "estimated_cost_range": {"min": 0, "max": 0, "average": 0},
+            "insurance_coverage_avg": 70
+        }
+
+    first = treatment_costs[0]
+    low, high = first["min"], first["max"]
+    total_average = total_covered = 0
+    for cost in treatment_costs:
+        if cost["min"] < low:
+            low = cost["min"]
+        if cost["max"] > high:
+            high = cost["max"]
+        total_average += cost["average"]
+        total_covered += cost["insurance_covered"]
+
+    count = len(treatment_costs)
+    return {
         "estimated_cost_range": {
-            "min": min((c["min"] for c in treatment_costs), default=0),
-            "max": max((c["max"] for c in treatment_costs), default=0),
-            "average": round(avg_treatment_cost, 2)
+            "min": low,
+            "max": high,
+            "average": round(total_average / count, 2)
         },
-        "insurance_coverage_avg": round(sum(c["insurance_covered"] for c in treatment_costs) / len(treatment_costs), 1) if treatment_costs else 70
+        "insurance_coverage_avg": round(total_covered / count, 1)
     }
 
-    return {
+
+# /match and /voice-match return ORJSONResponse directly. The model is
+# only documented via responses= (no response_model), so FastAPI never
+# re-validates the payload or runs it through jsonable_encoder
+_MATCH_RESPONSES = {200: {"model": EnhancedMatchResponse}}
+
+
+@router.post("/match", responses=_MATCH_RESPONSES)
+async def match_symptoms(request: SymptomRequest):
+    # AI analysis doesn't depend on the matches, so it overlaps with search + costs
+    (matches, treatment_costs), ai_analysis = await asyncio.gather(
+        _matches_with_costs(request.description),
+        ai_service.analyze_symptoms(
+            symptom_description=request.description,
+            patient_data=request.patientData
+        )
+    )
+
+    financial_summary = _financial_summary(treatment_costs)
+
+    return ORJSONResponse(content={
         "matches": matches,
         "ai_analysis": ai_analysis,
         "conditions": ai_analysis.get("conditions", []),
@@ -92,29 +152,77 @@ async def match_symptoms(request: SymptomRequest):
         "urgency_reasoning": ai_analysis.get("urgency_reasoning", "Consult a healthcare provider"),
         "treatment_costs": treatment_costs,
         "financial_summary": financial_summary
-    }
+    })
 
 @router.post("/add")
-async def add_symptom(request: dict):
+async def add_symptom(request: AddSymptomRequest, background_tasks: BackgroundTasks):
     """Add new symptom to database"""
 
+    # Only generate an id when the caller didn't send one
+    symptom_id = request.id or uuid.uuid4().hex
+    # Pinecone metadata can't hold nulls
+    metadata = request.model_dump(exclude_none=True)
+
     result = await vector_service.upsert_symptom_vector(
-        symptom_id=request.get("id", str(uuid.uuid4())),
-        description=request["description"],
-        metadata=request
+        symptom_id=symptom_id,
+        description=request.description,
+        metadata=metadata
     )
 
-    # Persist to Snowflake (best-effort). Don't fail the request if warehouse is unavailable.
+    # Persist to Snowflake (best-effort) after the response is sent
+    background_tasks.add_task(_insert_symptom_record, {
+        "id": symptom_id,
+        "description": request.description,
+        "metadata": metadata
+    })
+
+    return {"vector_upsert": result, "warehouse": {"status": "queued", "event_id": symptom_id}}
+
+
+async def _insert_symptom_record(record: Dict[str, Any]):
+    # Don't let an unavailable warehouse surface as a background task error
     try:
-        snow_result = await snowflake_client.insert_symptom_record({
-            "id": request.get("id", result.get("id")),
-            "description": request.get("description"),
-            "metadata": request
-        })
+        snow_result = await _symptom_record_batcher.submit(record)
     except Exception as e:
         snow_result = {"status": "error", "error": str(e)}
 
-    return {"vector_upsert": result, "warehouse": snow_result}
+    if snow_result.get("status") == "error":
+        print(f"Symptom warehouse insert failed: {snow_result['error']}")
+
+
+async def _flush_symptom_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    result = await snowflake_client.batch_insert_symptom_records(records)
+    return [result] * len(records)
+
+
+# Warehouse writes that queue up behind an in-flight insert go out as one
+# INSERT ... SELECT over a multi-row VALUES list
+_symptom_record_batcher = MicroBatcher(_flush_symptom_records, max_items=100)
+
+
+@router.on_event("shutdown")
+async def _stop_symptom_record_batcher():
+    _symptom_record_batcher.close()
+
+
+async def _read_image(file: UploadFile) -> bytes:
+    """Read an uploaded image, rejecting anything over MAX_IMAGE_UPLOAD_BYTES"""
+    if file.size is not None and file.size > MAX_IMAGE_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Image too large")
+
+    # Read at most one byte past the limit so oversized bodies never fully load
+    contents = await file.read(MAX_IMAGE_UPLOAD_BYTES + 1)
+    if len(contents) > MAX_IMAGE_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Image too large")
+    return contents
+
+
+async def _analyze_image(image: UploadFile) -> Dict:
+    contents = await _read_image(image)
+    return await ai_service.analyze_medical_image(
+        image_bytes=contents,
+        image_type=image.content_type
+    )
 
 
 @router.post("/upload-image")
@@ -123,16 +231,12 @@ async def upload_symptom_image(file: UploadFile = File(...)):
     Upload and analyze medical images (rashes, wounds, etc.)
     Uses GPT-4 Vision to extract relevant medical information
     """
-    try:
-        # Read image file
-        contents = await file.read()
-
-        # Convert to base64 for GPT-4 Vision
-        base64_image = base64.b64encode(contents).decode('utf-8')
+    contents = await _read_image(file)
 
+    try:
         # Analyze image with GPT-4 Vision
         analysis = await ai_service.analyze_medical_image(
-            base64_image=base64_image,
+            image_bytes=contents,
             image_type=file.content_type
         )
 
@@ -153,10 +257,9 @@ async def upload_voice_symptom(file: UploadFile = File(...), language: Optional[
     Supports: mp3, wav, m4a, aac, ogg, flac, webm (up to 3GB)
     """
     try:
-        contents = await file.read()
-
+        # Stream the spooled upload to ElevenLabs rather than reading it into memory
         transcription = await elevenlabs_service.transcribe_audio(
-            audio_data=contents,
+            audio_data=file.file,
             filename=file.filename,
             language_code=language
         )
@@ -171,7 +274,7 @@ async def upload_voice_symptom(file: UploadFile = File(...), language: Optional[
         raise HTTPException(status_code=500, detail=f"Voice transcription failed: {str(e)}")
 
 
-@router.post("/voice-match", response_model=EnhancedMatchResponse)
+@router.post("/voice-match", responses=_MATCH_RESPONSES)
 async def voice_symptom_match(
     file: UploadFile = File(...),
     language: Optional[str] = None,
@@ -185,52 +288,29 @@ async def voice_symptom_match(
     4. Financial cost estimates
     """
     try:
-        contents = await file.read()
-
+        # Stream the spooled upload to ElevenLabs rather than reading it into memory
         transcription = await elevenlabs_service.transcribe_audio(
-            audio_data=contents,
+            audio_data=file.file,
             filename=file.filename,
             language_code=language
         )
 
         symptom_text = transcription["text"]
 
-        import json
-        patient_dict = json.loads(patient_data) if patient_data else None
+        patient_dict = orjson.loads(patient_data) if patient_data else None
 
-        matches = await vector_service.query_similar_vectors(
-            symptom=symptom_text,
-            top_k=5
-        )
-
-        if not matches:
-            matches = vector_service.generate_fake_matches()
-
-        ai_analysis = await ai_service.analyze_symptoms(
-            symptom_description=symptom_text,
-            patient_data=patient_dict
+        (matches, treatment_costs), ai_analysis = await asyncio.gather(
+            _matches_with_costs(symptom_text),
+            ai_service.analyze_symptoms(
+                symptom_description=symptom_text,
+                patient_data=patient_dict
+            )
         )
 
-        treatment_costs = []
-        for match in matches[:3]:
-            cost_estimate = await knot_service.estimate_treatment_cost(
-                condition=match.get("condition", "Unknown"),
-                treatment=match.get("treatment", "Standard care")
-            )
-            treatment_costs.append(cost_estimate)
-
-        avg_treatment_cost = sum(c["average"] for c in treatment_costs) / len(treatment_costs) if treatment_costs else 0
-        financial_summary = {
-            "estimated_cost_range": {
-                "min": min((c["min"] for c in treatment_costs), default=0),
-                "max": max((c["max"] for c in treatment_costs), default=0),
-                "average": round(avg_treatment_cost, 2)
-            },
-            "insurance_coverage_avg": round(sum(c["insurance_covered"] for c in treatment_costs) / len(treatment_costs), 1) if treatment_costs else 70,
-            "transcription": transcription
-        }
+        financial_summary = _financial_summary(treatment_costs)
+        financial_summary["transcription"] = transcription
 
-        return {
+        return ORJSONResponse(content={
             "matches": matches,
             "ai_analysis": ai_analysis,
             "conditions": ai_analysis.get("conditions", []),
@@ -239,7 +319,7 @@ async def voice_symptom_match(
             "urgency_reasoning": ai_analysis.get("urgency_reasoning", "Consult a healthcare provider"),
             "treatment_costs": treatment_costs,
             "financial_summary": financial_summary
-        }
+        })
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Voice symptom matching failed: {str(e)}")
@@ -261,30 +341,20 @@ async def analyze_symptoms_endpoint(
     Accepts FormData with user_id, symptoms, patient_data (JSON string), and optional images
     """
     try:
-        import json
-
         # Parse patient data JSON
-        patient_dict = json.loads(patient_data) if patient_data else {}
+        patient_dict = orjson.loads(patient_data) if patient_data else {}
 
         # Collect all uploaded images
         images = [img for img in [image_0, image_1, image_2, image_3, image_4] if img is not None]
 
-        # Process images if provided
-        image_analyses = []
-        if images:
-            for image in images:
-                contents = await image.read()
-                base64_image = base64.b64encode(contents).decode('utf-8')
-                image_analysis = await ai_service.analyze_medical_image(
-                    base64_image=base64_image,
-                    image_type=image.content_type
-                )
-                image_analyses.append(image_analysis)
-
-        # Query similar symptoms
-        matches = await vector_service.query_similar_vectors(
-            symptom=symptoms,
-            top_k=5
+        # Analyze all images and query similar symptoms concurrently; the AI
+        # analysis below needs the image findings, the vector query doesn't
+        image_analyses, matches = await asyncio.gather(
+            asyncio.gather(*(_analyze_image(image) for image in images)),
+            vector_service.query_similar_vectors(
+                symptom=symptoms,
+                top_k=5
+            )
         )
 
         if not matches:
@@ -352,82 +422,88 @@ async def analyze_symptoms_endpoint(
         }
 
         # Cache the analysis for retrieval
-        ANALYSIS_CACHE[analysis_id] = result
+        await cache_set(make_key("analysis", analysis_id), result, ANALYSIS_TTL_SECONDS)
 
-        return result
+        # Plain JSON types only, so skip jsonable_encoder like /match does
+        return ORJSONResponse(content=result)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Symptom analysis failed: {str(e)}")
 
 
+# Mock analysis served for ids that are no longer (or never were) cached
+_FALLBACK_ANALYSIS = {
+    "twin": {
+        "id": "twin-1",
+        "similarity": 95,
+        "age": 32,
+        "gender": "Female",
+        "location": "Boston, MA",
+        "symptom_description": "Sharp, stabbing pain behind my left eye that gets worse when I swallow. Started 3 days ago and comes in waves throughout the day.",
+        "diagnosis": "Trigeminal Neuralgia",
+        "timeline": "Diagnosed after 2 weeks",
+        "treatment": "Carbamazepine 200mg twice daily + Physical therapy",
+        "outcome": "90% reduction in symptoms after 6 weeks of treatment"
+    },
+    "conditions": [
+        {
+            "name": "Trigeminal Neuralgia",
+            "probability": 87,
+            "description": "A chronic pain condition affecting the trigeminal nerve, causing sudden, severe facial pain."
+        },
+        {
+            "name": "Cluster Headache",
+            "probability": 72,
+            "description": "Severe headaches that occur in cyclical patterns, often around one eye."
+        },
+        {
+            "name": "Temporal Arteritis",
+            "probability": 45,
+            "description": "Inflammation of blood vessels in the head causing headaches and jaw pain."
+        }
+    ],
+    "recommendations": [
+        {
+            "type": "immediate",
+            "title": "Seek Medical Attention",
+            "description": "Based on your symptom match, consult a neurologist within 48 hours for proper diagnosis.",
+            "icon": "immediate"
+        },
+        {
+            "type": "consult",
+            "title": "Specialist Consultation",
+            "description": "Request referral to a facial pain specialist or neurology department.",
+            "icon": "consult"
+        },
+        {
+            "type": "monitor",
+            "title": "Track Symptoms",
+            "description": "Keep a daily log of pain episodes, triggers, and intensity on a scale of 1-10.",
+            "icon": "monitor"
+        },
+        {
+            "type": "lifestyle",
+            "title": "Avoid Known Triggers",
+            "description": "Based on your twin's experience: avoid cold air exposure, chewing hard foods, and touching the affected area.",
+            "icon": "lifestyle"
+        }
+    ]
+}
+
+
 @router.get("/analysis/{analysis_id}")
 async def get_analysis_by_id(analysis_id: str):
     """
     Get cached analysis by ID
-    Checks in-memory cache first, falls back to mock data if not found
+    Checks the analysis cache first, falls back to mock data if not found
     """
     # Check cache first
-    if analysis_id in ANALYSIS_CACHE:
-        return ANALYSIS_CACHE[analysis_id]
+    cached_analysis = await cache_get(make_key("analysis", analysis_id))
+    if cached_analysis is not None:
+        return cached_analysis
 
     # Fallback to mock data if analysis not found in cache
-    # This can happen if server restarts or for old analysis IDs
-    return {
-        "success": True,
-        "analysis_id": analysis_id,
-        "twin": {
-            "id": "twin-1",
-            "similarity": 95,
-            "age": 32,
-            "gender": "Female",
-            "location": "Boston, MA",
-            "symptom_description": "Sharp, stabbing pain behind my left eye that gets worse when I swallow. Started 3 days ago and comes in waves throughout the day.",
-            "diagnosis": "Trigeminal Neuralgia",
-            "timeline": "Diagnosed after 2 weeks",
-            "treatment": "Carbamazepine 200mg twice daily + Physical therapy",
-            "outcome": "90% reduction in symptoms after 6 weeks of treatment"
-        },
-        "conditions": [
-            {
-                "name": "Trigeminal Neuralgia",
-                "probability": 87,
-                "description": "A chronic pain condition affecting the trigeminal nerve, causing sudden, severe facial pain."
-            },
-            {
-                "name": "Cluster Headache",
-                "probability": 72,
-                "description": "Severe headaches that occur in cyclical patterns, often around one eye."
-            },
-            {
-                "name": "Temporal Arteritis",
-                "probability": 45,
-                "description": "Inflammation of blood vessels in the head causing headaches and jaw pain."
-            }
-        ],
-        "recommendations": [
-            {
-                "type": "immediate",
-                "title": "Seek Medical Attention",
-                "description": "Based on your symptom match, consult a neurologist within 48 hours for proper diagnosis.",
-                "icon": "immediate"
-            },
-            {
-                "type": "consult",
-                "title": "Specialist Consultation",
-                "description": "Request referral to a facial pain specialist or neurology department.",
-                "icon": "consult"
-            },
-            {
-                "type": "monitor",
-                "title": "Track Symptoms",
-                "description": "Keep a daily log of pain episodes, triggers, and intensity on a scale of 1-10.",
-                "icon": "monitor"
-            },
-            {
-                "type": "lifestyle",
-                "title": "Avoid Known Triggers",
-                "description": "Based on your twin's experience: avoid cold air exposure, chewing hard foods, and touching the affected area.",
-                "icon": "lifestyle"
-            }
-        ]
-    }
\ No newline at end of file
+    # This can happen if the analysis expired or for old analysis IDs
+    return {"success": True, "analysis_id": analysis_id, **_FALLBACK_ANALYSIS}
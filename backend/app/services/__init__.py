@@ -1,15 +1,38 @@
 # backend/app/services/__init__.py
-from . import vector_service
-from . import ai_service
-from . import knot_service
-from . import elevenlabs_service
-from . import agent_service
-from . import ai_doctor_service
-from . import doctor_service
-from . import predictive_service
-from . import photon_service
-from . import realtime_insights_service
-from . import notification_service
-from .dedalus_orchestrator import orchestrator
+"""
+Service modules, imported on first access (PEP 562)
+
+Importing one service (e.g. app.services.vector_service from
+populate_data.py) no longer pulls in every SDK the others depend on.
+"""
+
+import importlib
+
+_SUBMODULES = {
+    'vector_service',
+    'ai_service',
+    'knot_service',
+    'elevenlabs_service',
+    'agent_service',
+    'ai_doctor_service',
+    'doctor_service',
+    'predictive_service',
+    'photon_service',
+    'realtime_insights_service',
+    'notification_service',
+}
 
 __all__ = ['vector_service', 'ai_service', 'knot_service', 'elevenlabs_service', 'agent_service', 'ai_doctor_service', 'doctor_service', 'predictive_service', 'photon_service', 'realtime_insights_service', 'notification_service', 'orchestrator']
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        value = importlib.import_module(f'.{name}', __name__)
+    elif name == 'orchestrator':
+        value = importlib.import_module('.dedalus_orchestrator', __name__).orchestrator
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Cache so later lookups skip __getattr__
+    globals()[name] = value
+    return value
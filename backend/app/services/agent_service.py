@@ -1,6 +1,7 @@
 # backend/app/services/agent_service.py
 import os
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, Tuple, Any
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -121,12 +122,20 @@ class AgentSpecialist:
         }
 
 
-def get_specialist_agent(specialty: str) -> AgentSpecialist:
-    if specialty not in AGENT_PROMPTS:
-        raise ValueError(f"Unknown specialty: {specialty}")
+# Prompts never change, so each specialist is built once and shared
+_SPECIALISTS: Dict[str, AgentSpecialist] = {
+    specialty: AgentSpecialist(specialty, prompt)
+    for specialty, prompt in AGENT_PROMPTS.items()
+}
 
-    return AgentSpecialist(specialty, AGENT_PROMPTS[specialty])
+
+def get_specialist_agent(specialty: str) -> AgentSpecialist:
+    try:
+        return _SPECIALISTS[specialty]
+    except KeyError:
+        raise ValueError(f"Unknown specialty: {specialty}") from None
 
 
-def get_all_specialists() -> List[str]:
-    return list(AGENT_PROMPTS.keys())
+@lru_cache(maxsize=1)
+def get_all_specialists() -> Tuple[str, ...]:
+    return tuple(AGENT_PROMPTS.keys())
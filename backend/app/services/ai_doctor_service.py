@@ -1,10 +1,19 @@
 # backend/app/services/ai_doctor_service.py
 import os
-from typing import List, Dict, Optional
+import asyncio
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from typing_extensions import TypedDict
 from dotenv import load_dotenv
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 import json
+import random
+import time
+from collections import OrderedDict
 from datetime import datetime
+from ..db import redis_client
+from ..utils.cache import cache_get, cache_set, make_key
+from ..utils.rate_limiter import RateLimiter
 
 load_dotenv()
 
@@ -17,8 +26,94 @@ if gemini_api_key:
     gemini_model = genai.GenerativeModel('gemini-2.5-flash')
 
 
-# In-memory conversation store (replace with Redis/DB in production)
-conversation_store: Dict[str, List[Dict]] = {}
+DOCTOR_PERSONA = "You are Dr. AI, a compassionate and knowledgeable virtual medical consultant."
+
+# Sessions live in Redis (hash per session, sliding TTL) when REDIS_URL is set;
+# otherwise, or while Redis is unreachable, fall back to this in-memory
+# conversation store: least recently used order, same idle TTL, capped size
+conversation_store: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+
+SESSION_KEY_PREFIX = "ai_doctor:session:"
+SESSION_TTL_SECONDS = 3600
+CONVERSATION_STORE_MAX = 10_000
+
+# Prompts carry the last few turns verbatim; older ones are folded into a
+# rolling summary on the session's system message every few turns
+HISTORY_RECENT_MESSAGES = 12
+HISTORY_SUMMARY_EVERY = 6
+
+# Input budget for a reply prompt, checked locally with a ~4 chars/token
+# estimate (Gemini's count_tokens would itself be a network round trip)
+PROMPT_TOKEN_BUDGET = 32_000
+CHARS_PER_TOKEN = 4
+
+# Same persona + patient profile + complaint gets the same opening message
+INITIAL_MESSAGE_CACHE_TTL_SECONDS = 3600
+
+
+class ConsultationSummary(TypedDict):
+    """Response schema for Gemini's JSON mode (pydantic needs
+    typing_extensions.TypedDict before Python 3.12)"""
+    chief_complaint: str
+    key_points: List[str]
+    key_recommendations: List[str]
+    follow_up_needed: bool
+    urgency_level: str
+    summary: str
+
+
+# Summaries come back as schema-conforming JSON, so they parse in one step
+SUMMARY_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": ConsultationSummary
+}
+
+
+def _reply_guidelines(tier_guidance: str) -> str:
+    return f"""Continue this consultation naturally.
+
+Guidelines:
+1. Be empathetic and professional
+2. Ask clarifying questions when needed
+3. Provide medical insights responsibly
+4. Recommend seeing a human doctor for serious conditions
+5. {tier_guidance}
+6. Keep responses concise (2-4 paragraphs)
+7. Don't repeat information already discussed
+
+Respond as Dr. AI would naturally respond. No JSON, no formatting markers."""
+
+
+# Fixed tail of every doctor reply prompt, built once per tier
+FREE_TIER_GUIDELINES = _reply_guidelines("Provide helpful but general guidance (free tier)")
+PREMIUM_TIER_GUIDELINES = _reply_guidelines("Provide detailed analysis (premium tier)")
+
+_SPEAKERS = {"user": "Patient", "assistant": "Dr. AI"}
+
+# (patient_data key, label) pairs shown in the patient profile, in order
+PATIENT_CONTEXT_FIELDS = (
+    ("age", "Age"),
+    ("gender", "Gender"),
+    ("medicalHistory", "Medical History"),
+    ("medications", "Current Medications"),
+    ("allergyDetails", "Allergies"),
+)
+
+UNAVAILABLE_REPLY = "I apologize, but I'm experiencing technical difficulties. Please try again later or consult with a human doctor."
+FALLBACK_REPLY = "I apologize for the technical difficulty. Based on what you've shared, I recommend consulting with a healthcare provider for a proper evaluation. Is there anything specific you'd like me to clarify about your symptoms?"
+
+# In-flight Gemini calls from this process; bursts of consultations queue
+# here instead of all hitting the provider's rate limit at once
+GEMINI_MAX_CONCURRENCY = 16
+_gemini_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+
+# Project-wide request quota shared by every worker; a 429 that still gets
+# through is retried with jittered exponential backoff
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "1000"))
+MAX_RATE_LIMIT_RETRIES = 3
+MAX_RETRY_BACKOFF_SECONDS = 10.0
+
+_rate_limiter = RateLimiter("gemini", requests_per_minute=GEMINI_REQUESTS_PER_MINUTE)
 
 
 async def start_ai_consultation(
@@ -31,23 +126,25 @@ async def start_ai_consultation(
     """
     # Build patient context
     patient_context = _build_patient_context(patient_data, symptom_data)
+    prompt_prefix = _build_prompt_prefix(patient_context)
 
     # Generate initial greeting and questions
-    initial_message = await _generate_initial_consultation(patient_context, symptom_data)
+    # (also warms Gemini's implicit prefix cache for the rest of the session)
+    initial_message = await _generate_initial_consultation(prompt_prefix, symptom_data)
 
     # Initialize conversation
     session_id = f"{user_id}_{datetime.utcnow().timestamp()}"
-    conversation_store[session_id] = [
+    await _save_conversation(session_id, [
         {
             "role": "system",
-            "content": f"You are Dr. AI, a compassionate and knowledgeable virtual medical consultant. {patient_context}"
+            "content": prompt_prefix
         },
         {
             "role": "assistant",
             "content": initial_message,
             "timestamp": datetime.utcnow().isoformat()
         }
-    ]
+    ])
 
     return {
         "session_id": session_id,
@@ -67,38 +164,121 @@ async def continue_consultation(
     Continue an existing AI doctor consultation
     tier: "free" or "premium"
     """
-    if session_id not in conversation_store:
+    conversation = await _load_conversation(session_id)
+    if conversation is None:
         return {
             "error": "Session not found. Please start a new consultation.",
             "session_expired": True
         }
 
     # Add user message to conversation
-    conversation_store[session_id].append({
+    conversation.append({
         "role": "user",
         "content": user_message,
         "timestamp": datetime.utcnow().isoformat()
     })
 
-    # Generate AI response
+    # Generate AI response, folding older turns into the rolling summary
+    # alongside it once enough have piled up
+    fold_task = _start_history_fold(conversation)
     ai_response = await _generate_ai_doctor_response(
-        conversation_store[session_id],
+        conversation,
         tier=tier
     )
 
+    return await _finish_turn(session_id, conversation, ai_response, tier, fold_task)
+
+
+async def stream_consultation(
+    session_id: str,
+    user_message: str,
+    tier: str = "free"
+) -> Optional[AsyncIterator[str]]:
+    """
+    Continue a consultation with the reply streamed as text chunks
+
+    Returns None when the session is gone; otherwise an async iterator of
+    reply chunks. The turn is saved once the stream has been fully consumed.
+    """
+    conversation = await _load_conversation(session_id)
+    if conversation is None:
+        return None
+
+    conversation.append({
+        "role": "user",
+        "content": user_message,
+        "timestamp": datetime.utcnow().isoformat()
+    })
+    fold_task = _start_history_fold(conversation)
+
+    async def chunks():
+        parts = []
+        try:
+            async for text in _stream_ai_doctor_response(conversation, tier=tier):
+                parts.append(text)
+                yield text
+        except BaseException:
+            # Client went away mid-reply: nothing is saved for this turn
+            if fold_task is not None:
+                fold_task.cancel()
+            raise
+
+        await _finish_turn(session_id, conversation, "".join(parts).strip(), tier, fold_task)
+
+    return chunks()
+
+
+def _start_history_fold(conversation: List[Dict]) -> Optional[asyncio.Task]:
+    """
+    Summarize older turns in the background once enough are unsummarized;
+    _finish_turn applies the result
+    """
+    system = conversation[0]
+    summarized = system.get("summarized_count", 0)
+    unsummarized = len(conversation) - 1 - summarized
+    if not gemini_model or unsummarized <= HISTORY_RECENT_MESSAGES + HISTORY_SUMMARY_EVERY:
+        return None
+
+    fold_until = len(conversation) - 1 - HISTORY_RECENT_MESSAGES
+    previous_summary = system.get("history_summary")
+    messages = conversation[1 + summarized:1 + fold_until]
+
+    async def fold() -> Optional[Tuple[str, int]]:
+        history_summary = await _summarize_history(previous_summary, messages)
+        return (history_summary, fold_until) if history_summary else None
+
+    return asyncio.create_task(fold())
+
+
+async def _finish_turn(
+    session_id: str,
+    conversation: List[Dict],
+    ai_response: str,
+    tier: str,
+    fold_task: Optional[asyncio.Task]
+) -> Dict:
+    """
+    Record the reply (and any new rolling summary) and persist the session
+    """
+    folded = await fold_task if fold_task is not None else None
+    if folded:
+        system = conversation[0]
+        system["history_summary"], system["summarized_count"] = folded
+
     # Add AI response to conversation
-    conversation_store[session_id].append({
+    conversation.append({
         "role": "assistant",
         "content": ai_response,
         "timestamp": datetime.utcnow().isoformat()
     })
+    await _save_conversation(session_id, conversation)
 
     return {
         "session_id": session_id,
         "message": ai_response,
         "timestamp": datetime.utcnow().isoformat(),
         "tier": tier,
-        "message_count": len([m for m in conversation_store[session_id] if m["role"] == "user"])
+        "message_count": len([m for m in conversation if m["role"] == "user"])
     }
 
 
@@ -106,11 +286,10 @@ async def get_consultation_summary(session_id: str) -> Dict:
     """
     Generate a summary of the consultation
     """
-    if session_id not in conversation_store:
+    conversation = await _load_conversation(session_id)
+    if conversation is None:
         return {"error": "Session not found"}
 
-    conversation = conversation_store[session_id]
-
     # Extract all messages (skip system message)
     messages = [msg for msg in conversation if msg["role"] != "system"]
 
@@ -127,15 +306,110 @@ async def get_consultation_summary(session_id: str) -> Dict:
     }
 
 
-async def _generate_initial_consultation(patient_context: str, symptom_data: Dict) -> str:
+async def _load_conversation(session_id: str) -> Optional[List[Dict]]:
+    """
+    Load a consultation session, refreshing its TTL in the same round trip
+    """
+    if redis_client is not None:
+        try:
+            key = f"{SESSION_KEY_PREFIX}{session_id}"
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hget(key, "messages")
+                pipe.expire(key, SESSION_TTL_SECONDS)
+                messages, _ = await pipe.execute()
+
+            if messages:
+                return json.loads(messages)
+        except Exception as e:
+            print(f"Redis session load error, using local store: {e}")
+
+    entry = conversation_store.get(session_id)
+    if entry is None:
+        return None
+
+    last_access, conversation = entry
+    now = time.monotonic()
+    if now - last_access > SESSION_TTL_SECONDS:
+        conversation_store.pop(session_id, None)
+        return None
+
+    conversation_store[session_id] = (now, conversation)
+    conversation_store.move_to_end(session_id)
+    # Callers append turns before the reply exists; a copy keeps those out
+    # of the stored session until _save_conversation
+    return list(conversation)
+
+
+async def _save_conversation(session_id: str, conversation: List[Dict]) -> None:
+    """
+    Persist a consultation session
+    """
+    if redis_client is not None:
+        try:
+            key = f"{SESSION_KEY_PREFIX}{session_id}"
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping={
+                    "messages": json.dumps(conversation),
+                    "last_ts": conversation[-1].get("timestamp", "")
+                })
+                pipe.expire(key, SESSION_TTL_SECONDS)
+                await pipe.execute()
+            # Drop any copy left over from an earlier outage
+            conversation_store.pop(session_id, None)
+            return
+        except Exception as e:
+            print(f"Redis session save error, using local store: {e}")
+
+    conversation_store[session_id] = (time.monotonic(), conversation)
+    conversation_store.move_to_end(session_id)
+
+    # Sweep from the least recently used end: over capacity or idle too long
+    cutoff = time.monotonic() - SESSION_TTL_SECONDS
+    while conversation_store:
+        last_access, _ = next(iter(conversation_store.values()))
+        if len(conversation_store) <= CONVERSATION_STORE_MAX and last_access >= cutoff:
+            break
+        conversation_store.popitem(last=False)
+
+
+async def _generate(prompt: str, generation_config: Optional[Dict] = None):
+    """
+    One Gemini call, bounded by GEMINI_MAX_CONCURRENCY
+    """
+    async with _gemini_semaphore:
+        return await _send(prompt, generation_config=generation_config)
+
+
+async def _send(prompt: str, **kwargs):
+    """
+    Send a Gemini request under the shared quota
+
+    On ResourceExhausted (429) backs off and tries again, up to
+    MAX_RATE_LIMIT_RETRIES times; the last error propagates.
+    """
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        await _rate_limiter.acquire()
+        try:
+            return await gemini_model.generate_content_async(prompt, **kwargs)
+        except google_exceptions.ResourceExhausted:
+            if attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            await asyncio.sleep(_retry_backoff_seconds(attempt))
+
+
+def _retry_backoff_seconds(attempt: int) -> float:
+    # 1s, 2s, 4s... plus up to 1s of jitter so retrying workers don't hit
+    # the quota in lockstep
+    return min(2 ** attempt + random.random(), MAX_RETRY_BACKOFF_SECONDS)
+
+
+async def _generate_initial_consultation(prompt_prefix: str, symptom_data: Dict) -> str:
     """
     Generate initial AI doctor greeting and questions
     """
     symptoms = symptom_data.get("symptoms", "Not provided")
 
-    prompt = f"""You are Dr. AI, a compassionate virtual medical consultant. You are starting a consultation.
-
-{patient_context}
+    prompt = f"""{prompt_prefix}You are starting a consultation.
 
 Patient's main complaint:
 {symptoms}
@@ -152,9 +426,16 @@ Return ONLY the greeting message, no JSON or extra formatting."""
     if not gemini_model:
         return _fallback_initial_message(symptoms)
 
+    key = make_key("ai-doctor-initial", "gemini-2.5-flash", prompt)
+    cached = await cache_get(key)
+    if cached is not None:
+        return cached
+
     try:
-        response = gemini_model.generate_content(prompt)
-        return response.text.strip()
+        response = await _generate(prompt)
+        message = response.text.strip()
+        await cache_set(key, message, INITIAL_MESSAGE_CACHE_TTL_SECONDS)
+        return message
     except Exception as e:
         print(f"Gemini error in initial consultation: {e}")
         return _fallback_initial_message(symptoms)
@@ -165,41 +446,92 @@ async def _generate_ai_doctor_response(conversation: List[Dict], tier: str = "fr
     Generate AI doctor response based on conversation history
     """
     if not gemini_model:
-        return "I apologize, but I'm experiencing technical difficulties. Please try again later or consult with a human doctor."
+        return UNAVAILABLE_REPLY
+
+    try:
+        response = await _generate(_doctor_reply_prompt(conversation, tier))
+        return response.text.strip()
+    except Exception as e:
+        print(f"Gemini error in doctor response: {e}")
+        return FALLBACK_REPLY
+
+
+async def _stream_ai_doctor_response(conversation: List[Dict], tier: str = "free") -> AsyncIterator[str]:
+    """
+    Stream the AI doctor response as Gemini produces it
+    """
+    if not gemini_model:
+        yield UNAVAILABLE_REPLY
+        return
+
+    streamed = False
+    try:
+        # The slot covers issuing the request only; holding it while a slow
+        # SSE client reads would starve every other consultation
+        async with _gemini_semaphore:
+            response = await _send(_doctor_reply_prompt(conversation, tier), stream=True)
+        async for chunk in response:
+            if chunk.text:
+                streamed = True
+                yield chunk.text
+    except Exception as e:
+        print(f"Gemini error in streamed doctor response: {e}")
+        # Past the first chunk the client already has a partial reply
+        if not streamed:
+            yield FALLBACK_REPLY
 
+
+def _doctor_reply_prompt(conversation: List[Dict], tier: str) -> str:
+    """
+    Build the prompt for the doctor's next reply
+    """
     # Build conversation context for Gemini
-    # Skip system message, format for natural conversation
-    conversation_text = ""
-    for msg in conversation:
-        if msg["role"] == "system":
-            continue
-        elif msg["role"] == "user":
-            conversation_text += f"Patient: {msg['content']}\n\n"
-        elif msg["role"] == "assistant":
-            conversation_text += f"Dr. AI: {msg['content']}\n\n"
-
-    prompt = f"""You are Dr. AI, a compassionate and knowledgeable virtual medical consultant. Continue this consultation naturally.
-
-Previous conversation:
-{conversation_text}
+    # The system message is the session's stable prompt prefix; it goes first so
+    # every turn shares the same leading tokens (implicit prefix cache hit)
+    # Turns already folded into the rolling summary are left out
+    system = conversation[0]
+    prompt_prefix = system["content"]
+    history_summary = system.get("history_summary")
+    guidelines = PREMIUM_TIER_GUIDELINES if tier == "premium" else FREE_TIER_GUIDELINES
+    turns = [_format_turns([msg]) for msg in conversation[1 + system.get("summarized_count", 0):]]
 
-Guidelines:
-1. Be empathetic and professional
-2. Ask clarifying questions when needed
-3. Provide medical insights responsibly
-4. Recommend seeing a human doctor for serious conditions
-5. {"Provide detailed analysis (premium tier)" if tier == "premium" else "Provide helpful but general guidance (free tier)"}
-6. Keep responses concise (2-4 paragraphs)
-7. Don't repeat information already discussed
+    summary_section = f"Summary of earlier conversation:\n{history_summary}\n\n" if history_summary else ""
 
-Respond as Dr. AI would naturally respond. No JSON, no formatting markers."""
+    # Oversized turns (pasted records, long rants) would only fail or cost
+    # after the round trip; drop the oldest locally until the estimate fits,
+    # always keeping the newest message
+    prompt_chars = len(prompt_prefix) + len(summary_section) + len(guidelines) + sum(map(len, turns))
+    while len(turns) > 1 and prompt_chars // CHARS_PER_TOKEN > PROMPT_TOKEN_BUDGET:
+        prompt_chars -= len(turns.pop(0))
+
+    return f"""{prompt_prefix}{summary_section}Previous conversation:
+{"".join(turns)}
+
+{guidelines}"""
+
+
+async def _summarize_history(previous_summary: Optional[str], messages: List[Dict]) -> Optional[str]:
+    """
+    Fold older turns into the session's rolling summary; None on failure so
+    the turns stay verbatim and are retried on a later turn
+    """
+    conversation_text = _format_turns(messages)
+
+    earlier = f"Summary so far:\n{previous_summary}\n\n" if previous_summary else ""
+
+    prompt = f"""Condense this part of a medical consultation between Dr. AI and a patient.
+
+{earlier}Conversation:
+{conversation_text}
+Write at most 2 short paragraphs covering the symptoms, answers and advice so far.
+Keep every clinically relevant detail. Return ONLY the summary text."""
 
     try:
-        response = gemini_model.generate_content(prompt)
+        response = await _generate(prompt)
         return response.text.strip()
     except Exception as e:
-        print(f"Gemini error in doctor response: {e}")
-        return "I apologize for the technical difficulty. Based on what you've shared, I recommend consulting with a healthcare provider for a proper evaluation. Is there anything specific you'd like me to clarify about your symptoms?"
+        print(f"Gemini error summarizing conversation history: {e}")
+        return None
 
 
 async def _generate_consultation_summary(conversation: List[Dict]) -> Dict:
@@ -210,10 +542,7 @@ async def _generate_consultation_summary(conversation: List[Dict]) -> Dict:
         return _fallback_summary()
 
     # Build conversation for summary
-    conversation_text = ""
-    for msg in conversation[1:]:  # Skip system message
-        role = "Patient" if msg["role"] == "user" else "Dr. AI"
-        conversation_text += f"{role}: {msg['content']}\n\n"
+    conversation_text = _format_turns(conversation[1:])  # Skip system message
 
     prompt = f"""Summarize this medical consultation between Dr. AI and a patient.
 
@@ -233,30 +562,24 @@ Provide a JSON summary with:
 Return ONLY valid JSON."""
 
     try:
-        response = gemini_model.generate_content(prompt)
-        text = response.text.strip()
-
-        # Clean response
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
-
-        # Parse JSON
-        if "{" in text:
-            json_start = text.index("{")
-            json_end = text.rindex("}") + 1
-            return json.loads(text[json_start:json_end])
-        else:
-            return _fallback_summary()
+        response = await _generate(prompt, SUMMARY_GENERATION_CONFIG)
+        return json.loads(response.text)
     except Exception as e:
         print(f"Error generating summary: {e}")
         return _fallback_summary()
 
 
+def _format_turns(messages: List[Dict]) -> str:
+    """
+    Render chat turns as prompt text in one join (no quadratic +=)
+    """
+    return "".join(
+        f"{_SPEAKERS[msg['role']]}: {msg['content']}\n\n"
+        for msg in messages
+        if msg["role"] in _SPEAKERS
+    )
+
+
 def _build_patient_context(patient_data: Optional[Dict], symptom_data: Dict) -> str:
     """
     Build patient context string for AI
@@ -264,22 +587,25 @@ def _build_patient_context(patient_data: Optional[Dict], symptom_data: Dict) ->
     if not patient_data:
         return "Patient context: Limited information available"
 
-    context_parts = []
-
-    if patient_data.get("age"):
-        context_parts.append(f"Age: {patient_data['age']}")
-    if patient_data.get("gender"):
-        context_parts.append(f"Gender: {patient_data['gender']}")
-    if patient_data.get("medicalHistory") and patient_data["medicalHistory"] != "None":
-        context_parts.append(f"Medical History: {patient_data['medicalHistory']}")
-    if patient_data.get("medications") and patient_data["medications"] != "None":
-        context_parts.append(f"Current Medications: {patient_data['medications']}")
-    if patient_data.get("allergyDetails") and patient_data["allergyDetails"] != "None":
-        context_parts.append(f"Allergies: {patient_data['allergyDetails']}")
+    context_parts = [
+        f"{label}: {value}"
+        for key, label in PATIENT_CONTEXT_FIELDS
+        if (value := patient_data.get(key)) and value != "None"
+    ]
 
     return "Patient Profile:\n" + "\n".join(f"- {part}" for part in context_parts)
 
 
+def _build_prompt_prefix(patient_context: str) -> str:
+    """
+    Build the per-session prompt prefix shared by every Gemini call
+
+    Keeping it byte-identical across turns lets Gemini's implicit context
+    cache reuse the prefill for the persona and patient profile.
+    """
+    return f"{DOCTOR_PERSONA}\n\n{patient_context}\n\n"
+
+
 def _fallback_initial_message(symptoms: str) -> str:
     """
     Fallback initial message when Gemini is unavailable
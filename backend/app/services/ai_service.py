@@ -1,10 +1,14 @@
 # backend/app/services/ai-service.py
 import os
+import asyncio
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 import google.generativeai as genai
 import json
+import hashlib
+from ..utils.cache import cache_add, cache_get, cache_set, make_key
 
 load_dotenv()
 
@@ -16,12 +20,115 @@ openai_client = None
 gemini_model = None
 
 if openai_api_key:
-    openai_client = OpenAI(api_key=openai_api_key)
+    # Pooled HTTP/2 client: concurrent analyses multiplex over a few warm
+    # connections instead of queueing on httpx's default pool
+    openai_client = AsyncOpenAI(
+        api_key=openai_api_key,
+        http_client=httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=60.0
+        )
+    )
 
 if gemini_api_key:
     genai.configure(api_key=gemini_api_key)
     gemini_model = genai.GenerativeModel('gemini-pro')
 
+# Identical symptom descriptions reuse the model's analysis for a few minutes
+ANALYSIS_CACHE_TTL_SECONDS = 300
+ANALYSIS_WARM_CONCURRENCY = 4
+
+# Re-submitted images (retries, double uploads) reuse the vision result
+IMAGE_ANALYSIS_CACHE_TTL_SECONDS = 3600
+# Longest side sent to Gemini Vision; larger uploads are downscaled first
+IMAGE_ANALYSIS_MAX_SIDE = 1024
+
+# Fixed instruction text, built once instead of re-formatted per request
+GPT_SYSTEM_PROMPT = "You are a medical AI assistant. Provide accurate, cautious medical insights. Always recommend professional consultation for serious symptoms."
+
+GPT_ANALYSIS_FORMAT = """Provide a JSON response with the following structure:
+{
+  "conditions": [
+    {
+      "name": "Condition name",
+      "probability": 0.85,
+      "reasoning": "Brief explanation why this is likely",
+      "severity": "mild|moderate|severe"
+    }
+  ],
+  "urgency_level": "low|medium|high|emergency",
+  "urgency_reasoning": "Why this urgency level",
+  "recommendations": [
+    {
+      "type": "immediate|consult|lifestyle|monitor",
+      "action": "Specific recommendation",
+      "priority": "high|medium|low"
+    }
+  ],
+  "red_flags": ["Any concerning symptoms that need immediate attention"],
+  "summary": "Brief overall assessment"
+}
+
+Provide exactly 3 most likely conditions, ordered by probability. Be cautious and responsible - suggest medical consultation when appropriate.
+"""
+
+GEMINI_ANALYSIS_FORMAT = """Provide your response in the following JSON format:
+{
+  "conditions": [
+    {
+      "name": "Condition name",
+      "probability": 0.85,
+      "reasoning": "Brief explanation why this is likely",
+      "severity": "mild|moderate|severe"
+    },
+    // Include exactly 3 conditions
+  ],
+  "urgency_level": "low|medium|high|emergency",
+  "urgency_reasoning": "Explanation for the urgency level",
+  "recommendations": [
+    {
+      "type": "immediate|consult|lifestyle|monitor",
+      "action": "Specific actionable recommendation",
+      "priority": "high|medium|low"
+    },
+    // Include exactly 4 recommendations
+  ],
+  "red_flags": ["Any concerning symptoms requiring immediate attention"],
+  "summary": "Overall assessment and key takeaways"
+}
+
+Important:
+- Provide exactly 3 conditions ordered by probability
+- Include 4 actionable recommendations
+- Be cautious and recommend professional medical consultation when appropriate
+- Consider the patient's context in your analysis
+- Return ONLY valid JSON, no additional text"""
+
+IMAGE_ANALYSIS_PROMPT = """You are a medical image analysis assistant. Analyze this image and describe what you observe.
+
+Provide objective observations only, NOT diagnoses. Describe:
+- Visual characteristics (color, texture, size, location)
+- Any notable features or patterns
+- Severity indicators if applicable
+
+Return your response in JSON format:
+{
+  "description": "Overall description of what you see",
+  "observations": ["observation 1", "observation 2", "..."],
+  "severity_indicators": ["any concerning features"],
+  "recommendation": "Recommendation for next steps"
+}
+
+Be cautious and recommend professional medical consultation when appropriate.
+Return ONLY valid JSON."""
+
+
+async def close():
+    """Close the OpenAI client's connection pool (app shutdown)"""
+    if openai_client is not None:
+        await openai_client.close()
+
 
 async def analyze_symptoms_with_gpt(
     symptom_description: str,
@@ -55,37 +162,13 @@ Patient Context:
 Symptom Description:
 {symptom_description}
 
-Provide a JSON response with the following structure:
-{{
-  "conditions": [
-    {{
-      "name": "Condition name",
-      "probability": 0.85,
-      "reasoning": "Brief explanation why this is likely",
-      "severity": "mild|moderate|severe"
-    }}
-  ],
-  "urgency_level": "low|medium|high|emergency",
-  "urgency_reasoning": "Why this urgency level",
-  "recommendations": [
-    {{
-      "type": "immediate|consult|lifestyle|monitor",
-      "action": "Specific recommendation",
-      "priority": "high|medium|low"
-    }}
-  ],
-  "red_flags": ["Any concerning symptoms that need immediate attention"],
-  "summary": "Brief overall assessment"
-}}
-
-Provide exactly 3 most likely conditions, ordered by probability. Be cautious and responsible - suggest medical consultation when appropriate.
-"""
+{GPT_ANALYSIS_FORMAT}"""
 
     try:
-        response = openai_client.chat.completions.create(
+        response = await openai_client.chat.completions.create(
             model="gpt-4",
             messages=[
-                {"role": "system", "content": "You are a medical AI assistant. Provide accurate, cautious medical insights. Always recommend professional consultation for serious symptoms."},
+                {"role": "system", "content": GPT_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,  # Lower temperature for more consistent medical advice
@@ -135,40 +218,10 @@ Patient Context:
 Symptom Description:
 {symptom_description}
 
-Provide your response in the following JSON format:
-{{
-  "conditions": [
-    {{
-      "name": "Condition name",
-      "probability": 0.85,
-      "reasoning": "Brief explanation why this is likely",
-      "severity": "mild|moderate|severe"
-    }},
-    // Include exactly 3 conditions
-  ],
-  "urgency_level": "low|medium|high|emergency",
-  "urgency_reasoning": "Explanation for the urgency level",
-  "recommendations": [
-    {{
-      "type": "immediate|consult|lifestyle|monitor",
-      "action": "Specific actionable recommendation",
-      "priority": "high|medium|low"
-    }},
-    // Include exactly 4 recommendations
-  ],
-  "red_flags": ["Any concerning symptoms requiring immediate attention"],
-  "summary": "Overall assessment and key takeaways"
-}}
-
-Important:
-- Provide exactly 3 conditions ordered by probability
-- Include 4 actionable recommendations
-- Be cautious and recommend professional medical consultation when appropriate
-- Consider the patient's context in your analysis
-- Return ONLY valid JSON, no additional text"""
+{GEMINI_ANALYSIS_FORMAT}"""
 
     try:
-        response = gemini_model.generate_content(prompt)
+        response = await gemini_model.generate_content_async(prompt)
         text = response.text
 
         # Clean up the response - remove markdown code blocks if present
@@ -206,63 +259,69 @@ Important:
         return generate_fallback_analysis(symptom_description)
 
 
+# Generic analysis used when no model is available or a model call fails
+FALLBACK_ANALYSIS = {
+    "conditions": [
+        {
+            "name": "Consultation Recommended",
+            "probability": 0.75,
+            "reasoning": "Based on your symptoms, a medical professional should evaluate your condition",
+            "severity": "moderate"
+        },
+        {
+            "name": "Common Inflammatory Response",
+            "probability": 0.60,
+            "reasoning": "Symptoms may indicate an inflammatory condition",
+            "severity": "mild"
+        },
+        {
+            "name": "Stress-Related Symptoms",
+            "probability": 0.45,
+            "reasoning": "Symptoms could be stress or lifestyle related",
+            "severity": "mild"
+        }
+    ],
+    "urgency_level": "medium",
+    "urgency_reasoning": "Symptoms warrant medical consultation within 24-48 hours",
+    "recommendations": [
+        {
+            "type": "consult",
+            "action": "Schedule appointment with primary care physician",
+            "priority": "high"
+        },
+        {
+            "type": "monitor",
+            "action": "Track symptom progression and any changes",
+            "priority": "high"
+        },
+        {
+            "type": "lifestyle",
+            "action": "Maintain adequate hydration and rest",
+            "priority": "medium"
+        },
+        {
+            "type": "immediate",
+            "action": "Seek emergency care if symptoms worsen rapidly",
+            "priority": "medium"
+        }
+    ],
+    "red_flags": [
+        "Sudden worsening of symptoms",
+        "Difficulty breathing",
+        "Severe pain",
+        "Loss of consciousness"
+    ],
+    "summary": "Your symptoms should be evaluated by a healthcare professional. Monitor closely and seek immediate care if condition worsens."
+}
+
+
 def generate_fallback_analysis(symptom_description: str) -> Dict:
     """
     Generate a basic analysis when AI services are unavailable
+
+    Returns the shared FALLBACK_ANALYSIS; treat it as read-only
     """
-    return {
-        "conditions": [
-            {
-                "name": "Consultation Recommended",
-                "probability": 0.75,
-                "reasoning": "Based on your symptoms, a medical professional should evaluate your condition",
-                "severity": "moderate"
-            },
-            {
-                "name": "Common Inflammatory Response",
-                "probability": 0.60,
-                "reasoning": "Symptoms may indicate an inflammatory condition",
-                "severity": "mild"
-            },
-            {
-                "name": "Stress-Related Symptoms",
-                "probability": 0.45,
-                "reasoning": "Symptoms could be stress or lifestyle related",
-                "severity": "mild"
-            }
-        ],
-        "urgency_level": "medium",
-        "urgency_reasoning": "Symptoms warrant medical consultation within 24-48 hours",
-        "recommendations": [
-            {
-                "type": "consult",
-                "action": "Schedule appointment with primary care physician",
-                "priority": "high"
-            },
-            {
-                "type": "monitor",
-                "action": "Track symptom progression and any changes",
-                "priority": "high"
-            },
-            {
-                "type": "lifestyle",
-                "action": "Maintain adequate hydration and rest",
-                "priority": "medium"
-            },
-            {
-                "type": "immediate",
-                "action": "Seek emergency care if symptoms worsen rapidly",
-                "priority": "medium"
-            }
-        ],
-        "red_flags": [
-            "Sudden worsening of symptoms",
-            "Difficulty breathing",
-            "Severe pain",
-            "Loss of consciousness"
-        ],
-        "summary": "Your symptoms should be evaluated by a healthcare professional. Monitor closely and seek immediate care if condition worsens."
-    }
+    return FALLBACK_ANALYSIS
 
 
 async def analyze_symptoms(
@@ -274,14 +333,59 @@ async def analyze_symptoms(
     Main entry point for symptom analysis.
     Uses Google Gemini by default (hackathon track), GPT-4 as fallback
     """
+    if not (gemini_model or openai_client):
+        return generate_fallback_analysis(symptom_description)
+
+    key = _analysis_cache_key(symptom_description, patient_data, use_gpt)
+    hit = await cache_get(key)
+    if hit is not None:
+        return hit
+
     if use_gpt and openai_client:
-        return await analyze_symptoms_with_gpt(symptom_description, patient_data)
+        result = await analyze_symptoms_with_gpt(symptom_description, patient_data)
     elif gemini_model:
-        return await analyze_symptoms_with_gemini(symptom_description, patient_data)
-    elif openai_client:
-        return await analyze_symptoms_with_gpt(symptom_description, patient_data)
+        result = await analyze_symptoms_with_gemini(symptom_description, patient_data)
     else:
-        return generate_fallback_analysis(symptom_description)
+        result = await analyze_symptoms_with_gpt(symptom_description, patient_data)
+
+    # Don't pin the generic fallback a failed model call returns
+    if result is not FALLBACK_ANALYSIS:
+        await cache_set(key, result, ANALYSIS_CACHE_TTL_SECONDS)
+    return result
+
+
+async def warm_analysis_cache(symptom_descriptions: List[str]):
+    """
+    Run common symptom descriptions through analyze_symptoms so the first
+    real requests for them hit the cache
+    """
+    if not (gemini_model or openai_client):
+        return
+
+    # With Redis the cache is shared, so only the first worker to start warms it
+    if not await cache_add(make_key("symptom-analysis-warm"), True, ANALYSIS_CACHE_TTL_SECONDS):
+        return
+
+    semaphore = asyncio.Semaphore(ANALYSIS_WARM_CONCURRENCY)
+
+    async def warm(description: str):
+        async with semaphore:
+            try:
+                await analyze_symptoms(description)
+            except Exception as e:
+                print(f"Analysis warm-up error: {e}")
+
+    await asyncio.gather(*(warm(d) for d in symptom_descriptions))
+
+
+def _analysis_cache_key(
+    symptom_description: str,
+    patient_data: Optional[Dict],
+    use_gpt: bool
+) -> str:
+    # Case and whitespace differences shouldn't miss the cache
+    normalized = " ".join(symptom_description.lower().split())
+    return make_key("symptom-analysis", normalized, patient_data, use_gpt)
 
 
 async def generate_recommendations(
@@ -332,14 +436,15 @@ async def generate_recommendations(
 
 
 async def analyze_medical_image(
-    base64_image: str,
+    image_bytes: bytes,
     image_type: str = "image/jpeg"
 ) -> Dict:
     """
     Analyze medical images (rashes, wounds, etc.) using Gemini Vision (hackathon track)
-    """
-    import base64 as b64
 
+    Takes the raw upload bytes; PIL decodes them directly, so there's no
+    base64 round trip. Results are cached by a BLAKE2b digest of the bytes
+    """
     if not gemini_model:
         return {
             "description": "Image analysis unavailable - Gemini not configured",
@@ -347,61 +452,14 @@ async def analyze_medical_image(
             "recommendation": "Please consult a healthcare provider with your image"
         }
 
-    try:
-        # Gemini Vision requires PIL Image
-        import io
-        from PIL import Image
-
-        # Decode base64 image
-        image_bytes = b64.b64decode(base64_image)
-        image = Image.open(io.BytesIO(image_bytes))
-
-        prompt = """You are a medical image analysis assistant. Analyze this image and describe what you observe.
-
-Provide objective observations only, NOT diagnoses. Describe:
-- Visual characteristics (color, texture, size, location)
-- Any notable features or patterns
-- Severity indicators if applicable
-
-Return your response in JSON format:
-{
-  "description": "Overall description of what you see",
-  "observations": ["observation 1", "observation 2", "..."],
-  "severity_indicators": ["any concerning features"],
-  "recommendation": "Recommendation for next steps"
-}
-
-Be cautious and recommend professional medical consultation when appropriate.
-Return ONLY valid JSON."""
-
-        # Use Gemini with vision
-        response = gemini_model.generate_content([prompt, image])
-        text = response.text
-
-        # Clean up response
-        text = text.strip()
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
-
-        # Try to parse JSON
-        if "{" in text:
-            json_start = text.index("{")
-            json_end = text.rindex("}") + 1
-            result = json.loads(text[json_start:json_end])
-            return result
-        else:
-            # Fallback: return as description
-            return {
-                "description": text,
-                "observations": [],
-                "recommendation": "Consult healthcare provider for professional evaluation"
-            }
+    digest = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+    key = make_key("image-analysis", digest, image_type)
+    hit = await cache_get(key)
+    if hit is not None:
+        return hit
 
+    try:
+        result = await _analyze_medical_image(image_bytes)
     except Exception as e:
         print(f"Gemini image analysis error: {e}")
         return {
@@ -409,3 +467,50 @@ Return ONLY valid JSON."""
             "observations": [str(e)],
             "recommendation": "Please consult a healthcare provider with your image"
         }
+
+    await cache_set(key, result, IMAGE_ANALYSIS_CACHE_TTL_SECONDS)
+    return result
+
+
+def _generate_image_analysis(image_bytes: bytes):
+    # Gemini Vision requires PIL Image
+    import io
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(image_bytes))
+    # Phone photos are often 12MP+; the model doesn't need more than this,
+    # and smaller uploads mean a faster request
+    image.thumbnail((IMAGE_ANALYSIS_MAX_SIDE, IMAGE_ANALYSIS_MAX_SIDE))
+    return gemini_model.generate_content([IMAGE_ANALYSIS_PROMPT, image])
+
+
+async def _analyze_medical_image(image_bytes: bytes) -> Dict:
+    """Run one Gemini Vision call; raises on failure so errors aren't cached"""
+    # Use Gemini with vision. Decoding, downscaling and the sync call (which
+    # re-encodes the image) all run in a worker thread
+    response = await asyncio.to_thread(_generate_image_analysis, image_bytes)
+    text = response.text
+
+    # Clean up response
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    elif text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    text = text.strip()
+
+    # Try to parse JSON
+    if "{" in text:
+        json_start = text.index("{")
+        json_end = text.rindex("}") + 1
+        result = json.loads(text[json_start:json_end])
+        return result
+    else:
+        # Fallback: return as description
+        return {
+            "description": text,
+            "observations": [],
+            "recommendation": "Consult healthcare provider for professional evaluation"
+        }
@@ -1,5 +1,6 @@
 # backend/app/services/dedalus_orchestrator.py
 import os
+import re
 from typing import Dict, List, Any
 from dotenv import load_dotenv
 from dedalus_labs import Dedalus
@@ -11,6 +12,20 @@ load_dotenv()
 DEDALUS_API_KEY = os.getenv("DEDALUS_API_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+# Keyword scans over agent assessments, compiled once (one case-insensitive
+# pass per pattern instead of lowercasing and scanning per keyword)
+SPECIALTY_PATTERNS = (
+    ("cardiology", re.compile(r"heart|cardiac|chest", re.IGNORECASE)),
+    ("neurology", re.compile(r"head|neuro|brain|migraine", re.IGNORECASE)),
+    ("gastroenterology", re.compile(r"stomach|abdominal|digest|gerd", re.IGNORECASE)),
+)
+# First match wins, so order matters
+CONDITION_PATTERNS = (
+    (re.compile(r"migraine", re.IGNORECASE), {"condition": "Migraine", "treatment": "Triptans medication"}),
+    (re.compile(r"gerd", re.IGNORECASE), {"condition": "GERD", "treatment": "Proton pump inhibitors"}),
+    (re.compile(r"cardiac|heart", re.IGNORECASE), {"condition": "Cardiac Event", "treatment": "Emergency care"}),
+)
+
 
 class DedalusOrchestrator:
     def __init__(self):
@@ -169,15 +184,12 @@ Based on this data and your {agent_type} expertise, provide your assessment.
 
     def _extract_specialties(self, triage_result: Dict) -> List[str]:
         """Extract recommended specialties from triage"""
-        assessment = str(triage_result.get("assessment", "")).lower()
+        assessment = str(triage_result.get("assessment", ""))
 
-        specialties = []
-        if any(word in assessment for word in ["heart", "cardiac", "chest"]):
-            specialties.append("cardiology")
-        if any(word in assessment for word in ["head", "neuro", "brain", "migraine"]):
-            specialties.append("neurology")
-        if any(word in assessment for word in ["stomach", "abdominal", "digest", "gerd"]):
-            specialties.append("gastroenterology")
+        specialties = [
+            specialty for specialty, pattern in SPECIALTY_PATTERNS
+            if pattern.search(assessment)
+        ]
 
         return specialties if specialties else ["cardiology", "neurology"]
 
@@ -187,12 +199,10 @@ Based on this data and your {agent_type} expertise, provide your assessment.
 
         for specialty, result in specialist_results.items():
             assessment = result.get("assessment", "")
-            if "migraine" in assessment.lower():
-                conditions.append({"condition": "Migraine", "treatment": "Triptans medication"})
-            elif "gerd" in assessment.lower():
-                conditions.append({"condition": "GERD", "treatment": "Proton pump inhibitors"})
-            elif "cardiac" in assessment.lower() or "heart" in assessment.lower():
-                conditions.append({"condition": "Cardiac Event", "treatment": "Emergency care"})
+            for pattern, condition in CONDITION_PATTERNS:
+                if pattern.search(assessment):
+                    conditions.append(dict(condition))
+                    break
 
         return {"conditions": conditions if conditions else [{"condition": "General", "treatment": "Standard care"}]}
 
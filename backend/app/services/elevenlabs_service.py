@@ -1,8 +1,14 @@
 # backend/app/services/elevenlabs_service.py
 import os
+import asyncio
+import hashlib
+import time
 import httpx
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import AsyncIterator, BinaryIO, Dict, Optional, Union
 from dotenv import load_dotenv
+from ..db import redis_client
+from ..utils.rate_limiter import RateLimiter
 
 load_dotenv()
 
@@ -10,12 +16,67 @@ ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 ELEVENLABS_BASE_URL = "https://api.elevenlabs.io/v1"
 MOCK_ENABLED = not ELEVENLABS_API_KEY or ELEVENLABS_API_KEY == ""
 
+# Account-wide quota shared by every worker (0 chars = no character limit)
+ELEVENLABS_REQUESTS_PER_MINUTE = int(os.getenv("ELEVENLABS_REQUESTS_PER_MINUTE", "100"))
+ELEVENLABS_CHARS_PER_MINUTE = int(os.getenv("ELEVENLABS_CHARS_PER_MINUTE", "0"))
+MAX_RATE_LIMIT_RETRIES = 3
+MAX_RETRY_AFTER_SECONDS = 60.0
+
+_rate_limiter = RateLimiter(
+    "elevenlabs",
+    requests_per_minute=ELEVENLABS_REQUESTS_PER_MINUTE,
+    units_per_minute=ELEVENLABS_CHARS_PER_MINUTE or None
+)
+
+# Rendered clips are reused for identical (text, voice, model) requests
+SPEECH_CACHE_PREFIX = "elevenlabs:tts:"
+SPEECH_CACHE_TTL_SECONDS = 7 * 24 * 3600
+SPEECH_LOCAL_CACHE_MAX_CLIPS = 128
+
+_local_speech_cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+# Low-latency model for real-time voice (reminders, calls)
+REALTIME_TTS_MODEL = "eleven_flash_v2_5"
+
+# Library voices can be removed; reminders fall back to a voice we own
+DEFAULT_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"  # Rachel
+FALLBACK_VOICE_ID = os.getenv("ELEVENLABS_FALLBACK_VOICE_ID", DEFAULT_VOICE_ID)
+VOICE_LIST_TTL_SECONDS = 24 * 3600
+
+_voice_ids: Optional[frozenset] = None
+_voice_ids_loaded_at = 0.0
+
+# One pooled client for every ElevenLabs call, so calls reuse warm
+# connections instead of paying a TLS handshake each
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=60.0)
+    return _http_client
+
+
+async def close():
+    """Close the shared HTTP client (app shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 async def transcribe_audio(
-    audio_data: bytes,
+    audio_data: Union[bytes, BinaryIO],
     filename: str,
     language_code: Optional[str] = None
 ) -> Dict:
+    """
+    Speech-to-text via ElevenLabs Scribe
+
+    audio_data may be an open binary file (e.g. UploadFile.file); it is
+    streamed to the API in chunks instead of being loaded into memory
+    """
     if MOCK_ENABLED:
         return {
             "text": "I have been experiencing severe headaches on the left side of my head, along with nausea and sensitivity to light. The pain is throbbing and lasts for several hours.",
@@ -25,34 +86,36 @@ async def transcribe_audio(
         }
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            files = {
-                "file": (filename, audio_data, get_content_type(filename))
-            }
-            headers = {
-                "xi-api-key": ELEVENLABS_API_KEY
-            }
-            data = {
-                "model_id": "scribe_v1"
-            }
-            if language_code:
-                data["language_code"] = language_code
-
-            response = await client.post(
-                f"{ELEVENLABS_BASE_URL}/speech-to-text",
-                headers=headers,
-                files=files,
-                data=data
-            )
-            response.raise_for_status()
+        client = _get_client()
+        files = {
+            "file": (filename, audio_data, get_content_type(filename))
+        }
+        headers = {
+            "xi-api-key": ELEVENLABS_API_KEY
+        }
+        data = {
+            "model_id": "scribe_v1"
+        }
+        if language_code:
+            data["language_code"] = language_code
 
-            result = response.json()
-            return {
-                "text": result.get("text", ""),
-                "duration": result.get("duration"),
-                "language": result.get("language_code", language_code or "en"),
-                "model": "scribe_v1"
-            }
+        response = await _send(
+            client,
+            "POST",
+            f"{ELEVENLABS_BASE_URL}/speech-to-text",
+            headers=headers,
+            files=files,
+            data=data
+        )
+        response.raise_for_status()
+
+        result = response.json()
+        return {
+            "text": result.get("text", ""),
+            "duration": result.get("duration"),
+            "language": result.get("language_code", language_code or "en"),
+            "model": "scribe_v1"
+        }
 
     except httpx.HTTPError as e:
         raise Exception(f"ElevenLabs API error: {str(e)}")
@@ -83,34 +146,155 @@ async def text_to_speech(
         return b"MOCK_AUDIO_DATA"
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            headers = {
-                "xi-api-key": ELEVENLABS_API_KEY,
-                "Content-Type": "application/json"
+        client = _get_client()
+        headers = {
+            "xi-api-key": ELEVENLABS_API_KEY,
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "text": text,
+            "model_id": model_id,
+            "voice_settings": {
+                "stability": stability,
+                "similarity_boost": similarity_boost
             }
+        }
 
-            payload = {
-                "text": text,
-                "model_id": model_id,
-                "voice_settings": {
-                    "stability": stability,
-                    "similarity_boost": similarity_boost
-                }
+        response = await _send(
+            client,
+            "POST",
+            f"{ELEVENLABS_BASE_URL}/text-to-speech/{voice_id}",
+            units=len(text),
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+
+        return response.content
+
+    except httpx.HTTPError as e:
+        raise Exception(f"ElevenLabs TTS error: {str(e)}")
+
+
+async def text_to_speech_stream(
+    text: str,
+    voice_id: str = "21m00Tcm4TlvDq8ikWAM",
+    model_id: str = REALTIME_TTS_MODEL,
+    stability: float = 0.5,
+    similarity_boost: float = 0.75
+) -> AsyncIterator[bytes]:
+    """
+    Stream speech (MP3 chunks) as ElevenLabs synthesizes it
+
+    Lets a phone or WebRTC sink start playback before the full clip is
+    rendered.
+    """
+    if MOCK_ENABLED:
+        yield b"MOCK_AUDIO_DATA"
+        return
+
+    try:
+        client = _get_client()
+        headers = {
+            "xi-api-key": ELEVENLABS_API_KEY,
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "text": text,
+            "model_id": model_id,
+            "voice_settings": {
+                "stability": stability,
+                "similarity_boost": similarity_boost
             }
+        }
 
-            response = await client.post(
-                f"{ELEVENLABS_BASE_URL}/text-to-speech/{voice_id}",
-                headers=headers,
-                json=payload
-            )
+        await _rate_limiter.acquire(units=len(text))
+        async with client.stream(
+            "POST",
+            f"{ELEVENLABS_BASE_URL}/text-to-speech/{voice_id}/stream",
+            headers=headers,
+            json=payload
+        ) as response:
             response.raise_for_status()
-
-            return response.content
+            async for chunk in response.aiter_bytes():
+                yield chunk
 
     except httpx.HTTPError as e:
         raise Exception(f"ElevenLabs TTS error: {str(e)}")
 
 
+async def text_to_speech_cached(
+    text: str,
+    voice_id: str = "21m00Tcm4TlvDq8ikWAM",
+    model_id: str = "eleven_monolingual_v1"
+) -> bytes:
+    """
+    text_to_speech() with the rendered clip cached by content hash
+
+    Reminder texts repeat ("Take 500mg of Ibuprofen"), so repeats skip the
+    TTS round-trip. Uses Redis when configured, otherwise a small
+    per-process LRU.
+    """
+    voice_id = await resolve_voice_id(voice_id)
+    digest = hashlib.sha256(f"{voice_id}|{model_id}|{text}".encode("utf-8")).hexdigest()
+    key = SPEECH_CACHE_PREFIX + digest
+
+    if redis_client is None:
+        audio = _local_speech_cache.get(key)
+        if audio is not None:
+            _local_speech_cache.move_to_end(key)
+            return audio
+    else:
+        try:
+            audio = await redis_client.get(key)
+            if audio is not None:
+                return audio
+        except Exception as e:
+            print(f"Speech cache read error: {e}")
+
+    audio = await text_to_speech(text=text, voice_id=voice_id, model_id=model_id)
+
+    if redis_client is None:
+        _local_speech_cache[key] = audio
+        while len(_local_speech_cache) > SPEECH_LOCAL_CACHE_MAX_CLIPS:
+            _local_speech_cache.popitem(last=False)
+    else:
+        try:
+            await redis_client.set(key, audio, ex=SPEECH_CACHE_TTL_SECONDS)
+        except Exception as e:
+            print(f"Speech cache write error: {e}")
+
+    return audio
+
+
+async def resolve_voice_id(voice_id: str) -> str:
+    """
+    Return voice_id if the account still has it, else FALLBACK_VOICE_ID
+
+    The voice list is fetched at most once per VOICE_LIST_TTL_SECONDS per
+    process, so this doesn't add an API round-trip per call. If the list
+    can't be fetched the requested voice is used as-is.
+    """
+    global _voice_ids, _voice_ids_loaded_at
+
+    if _voice_ids is None or time.monotonic() - _voice_ids_loaded_at >= VOICE_LIST_TTL_SECONDS:
+        try:
+            voices = await get_available_voices()
+        except Exception as e:
+            print(f"Voice list unavailable, using {voice_id} unchecked: {e}")
+            return voice_id
+        _voice_ids = frozenset(v.get("voice_id") for v in voices.get("voices", []))
+        _voice_ids_loaded_at = time.monotonic()
+
+    if voice_id in _voice_ids:
+        return voice_id
+
+    print(f"⚠️ ElevenLabs voice {voice_id} not found, falling back to {FALLBACK_VOICE_ID}")
+    return FALLBACK_VOICE_ID
+
+
 async def get_available_voices() -> Dict:
     """
     Get list of available ElevenLabs voices
@@ -140,21 +324,55 @@ async def get_available_voices() -> Dict:
         }
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            headers = {"xi-api-key": ELEVENLABS_API_KEY}
+        client = _get_client()
+        headers = {"xi-api-key": ELEVENLABS_API_KEY}
 
-            response = await client.get(
-                f"{ELEVENLABS_BASE_URL}/voices",
-                headers=headers
-            )
-            response.raise_for_status()
+        response = await _send(
+            client,
+            "GET",
+            f"{ELEVENLABS_BASE_URL}/voices",
+            headers=headers,
+            timeout=30.0
+        )
+        response.raise_for_status()
 
-            return response.json()
+        return response.json()
 
     except httpx.HTTPError as e:
         raise Exception(f"ElevenLabs API error: {str(e)}")
 
 
+async def _send(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    units: int = 0,
+    **kwargs
+) -> httpx.Response:
+    """
+    Send an ElevenLabs request under the shared quota
+
+    On a 429 waits for Retry-After and tries again, up to
+    MAX_RATE_LIMIT_RETRIES times; the last response is returned as-is.
+    """
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        await _rate_limiter.acquire(units=units)
+        response = await client.request(method, url, **kwargs)
+        if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+            return response
+        await asyncio.sleep(_retry_after_seconds(response))
+
+    return response
+
+
+def _retry_after_seconds(response: httpx.Response) -> float:
+    try:
+        delay = float(response.headers.get("retry-after", "1"))
+    except ValueError:
+        delay = 1.0
+    return min(max(delay, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
 def get_content_type(filename: str) -> str:
     extension = filename.lower().split('.')[-1]
     content_types = {
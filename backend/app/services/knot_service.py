@@ -1,6 +1,9 @@
 # backend/app/services/knot_service.py
 import os
-from typing import List, Dict, Optional
+import asyncio
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import random
@@ -11,6 +14,13 @@ KNOT_API_KEY = os.getenv("KNOT_API_KEY")
 KNOT_BASE_URL = "https://api.knotapi.com"
 MOCK_ENABLED = not KNOT_API_KEY or KNOT_API_KEY == ""
 
+# Per-user spending summary cache (several endpoints read the same summary)
+SPENDING_SUMMARY_TTL_SECONDS = 60
+SPENDING_SUMMARY_CACHE_SIZE = 1024
+
+_spending_summary_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+_spending_summary_locks: Dict[str, asyncio.Lock] = {}
+
 
 async def create_knot_session(user_id: str) -> Dict:
     if MOCK_ENABLED:
@@ -55,39 +65,41 @@ async def categorize_medical_spending(transactions: List[Dict]) -> Dict:
     return categories
 
 
-async def estimate_treatment_cost(condition: str, treatment: str) -> Dict:
-    cost_database = {
-        "Migraine": {
-            "Triptans medication": {"min": 30, "max": 150, "average": 75, "insurance_covered": 80},
-            "Preventive medications": {"min": 20, "max": 200, "average": 85, "insurance_covered": 70}
-        },
-        "Occipital Neuralgia": {
-            "Nerve block injection": {"min": 500, "max": 2000, "average": 1200, "insurance_covered": 60},
-            "Physical therapy": {"min": 100, "max": 400, "average": 200, "insurance_covered": 75}
-        },
-        "GERD": {
-            "Proton pump inhibitors": {"min": 10, "max": 100, "average": 40, "insurance_covered": 85},
-            "Endoscopy": {"min": 800, "max": 3000, "average": 1500, "insurance_covered": 70}
-        },
-        "Gout": {
-            "Colchicine and dietary changes": {"min": 25, "max": 150, "average": 60, "insurance_covered": 80},
-            "Uric acid testing": {"min": 50, "max": 200, "average": 100, "insurance_covered": 90}
-        },
-        "TMJ Disorder": {
-            "Mouth guard and jaw exercises": {"min": 200, "max": 800, "average": 450, "insurance_covered": 50}
-        },
-        "Restless Leg Syndrome": {
-            "Iron supplementation and dopamine agonists": {"min": 30, "max": 200, "average": 90, "insurance_covered": 75}
-        }
+# Typical cost ranges by condition and treatment
+TREATMENT_COSTS = {
+    "Migraine": {
+        "Triptans medication": {"min": 30, "max": 150, "average": 75, "insurance_covered": 80},
+        "Preventive medications": {"min": 20, "max": 200, "average": 85, "insurance_covered": 70}
+    },
+    "Occipital Neuralgia": {
+        "Nerve block injection": {"min": 500, "max": 2000, "average": 1200, "insurance_covered": 60},
+        "Physical therapy": {"min": 100, "max": 400, "average": 200, "insurance_covered": 75}
+    },
+    "GERD": {
+        "Proton pump inhibitors": {"min": 10, "max": 100, "average": 40, "insurance_covered": 85},
+        "Endoscopy": {"min": 800, "max": 3000, "average": 1500, "insurance_covered": 70}
+    },
+    "Gout": {
+        "Colchicine and dietary changes": {"min": 25, "max": 150, "average": 60, "insurance_covered": 80},
+        "Uric acid testing": {"min": 50, "max": 200, "average": 100, "insurance_covered": 90}
+    },
+    "TMJ Disorder": {
+        "Mouth guard and jaw exercises": {"min": 200, "max": 800, "average": 450, "insurance_covered": 50}
+    },
+    "Restless Leg Syndrome": {
+        "Iron supplementation and dopamine agonists": {"min": 30, "max": 200, "average": 90, "insurance_covered": 75}
     }
+}
 
+
+async def estimate_treatment_cost(condition: str, treatment: str) -> Dict:
     default_estimate = {
         "min": 50, "max": 500, "average": 200,
         "insurance_covered": 70, "out_of_pocket_estimate": 60
     }
 
-    if condition in cost_database and treatment in cost_database[condition]:
-        estimate = cost_database[condition][treatment]
+    estimate = TREATMENT_COSTS.get(condition, {}).get(treatment)
+    if estimate:
         coverage_percent = estimate["insurance_covered"] / 100
         out_of_pocket = estimate["average"] * (1 - coverage_percent)
 
@@ -183,6 +195,46 @@ def generate_mock_medical_transactions(months: int = 12) -> List[Dict]:
 
 
 async def get_spending_summary(user_id: str) -> Dict:
+    """
+    Spending summary for a user, cached for SPENDING_SUMMARY_TTL_SECONDS
+
+    Concurrent misses for the same user share a single upstream fetch.
+    """
+    summary = _get_cached_spending_summary(user_id)
+    if summary is not None:
+        return summary
+
+    lock = _spending_summary_locks.setdefault(user_id, asyncio.Lock())
+    try:
+        async with lock:
+            summary = _get_cached_spending_summary(user_id)
+            if summary is None:
+                summary = await _build_spending_summary(user_id)
+                _spending_summary_cache[user_id] = (time.monotonic() + SPENDING_SUMMARY_TTL_SECONDS, summary)
+                _spending_summary_cache.move_to_end(user_id)
+                while len(_spending_summary_cache) > SPENDING_SUMMARY_CACHE_SIZE:
+                    _spending_summary_cache.popitem(last=False)
+    finally:
+        if not lock.locked():
+            _spending_summary_locks.pop(user_id, None)
+
+    return summary
+
+
+def _get_cached_spending_summary(user_id: str) -> Optional[Dict]:
+    entry = _spending_summary_cache.get(user_id)
+    if entry is None:
+        return None
+
+    expires_at, summary = entry
+    if expires_at < time.monotonic():
+        _spending_summary_cache.pop(user_id, None)
+        return None
+
+    return summary
+
+
+async def _build_spending_summary(user_id: str) -> Dict:
     transactions = await get_medical_transactions(user_id, months=12)
     categories = await categorize_medical_spending(transactions)
 
@@ -14,10 +14,22 @@ Track: Amazon Practical AI (Practical health reminders)
 Track: ElevenLabs MLH (Voice notifications)
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
+import asyncio
 import json
+import uuid
+from ..utils.cache import cache_get, cache_set, cache_delete, make_key
+
+
+# Bulk outbreak alerts are stored and delivered in chunks, a few at a time
+BULK_ALERT_CHUNK_SIZE = 500
+BULK_ALERT_MAX_CONCURRENT_CHUNKS = 16
+
+# Read-path cache TTLs; writes invalidate the user's entries
+PREFERENCES_CACHE_TTL = 300
+NOTIFICATIONS_CACHE_TTL = 30
 
 
 class NotificationType(str, Enum):
@@ -58,9 +70,10 @@ class Notification:
         priority: NotificationPriority = NotificationPriority.MEDIUM,
         channels: List[NotificationChannel] = None,
         scheduled_time: Optional[datetime] = None,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        notification_id: Optional[str] = None
     ):
-        self.notification_id = f"notif_{datetime.now().timestamp()}"
+        self.notification_id = notification_id or f"notif_{datetime.now().timestamp()}"
         self.user_id = user_id
         self.notification_type = notification_type
         self.title = title
@@ -79,6 +92,9 @@ class Notification:
 notifications_store: Dict[str, List[Notification]] = {}
 notification_preferences: Dict[str, Dict] = {}
 
+# Voice deliveries rendering in the background (strong refs until done)
+_voice_tasks: Set[asyncio.Task] = set()
+
 
 async def create_notification(
     user_id: str,
@@ -88,11 +104,15 @@ async def create_notification(
     priority: NotificationPriority = NotificationPriority.MEDIUM,
     channels: List[NotificationChannel] = None,
     scheduled_time: Optional[datetime] = None,
-    metadata: Optional[Dict] = None
+    metadata: Optional[Dict] = None,
+    notification_id: Optional[str] = None
 ) -> Dict:
     """
     Create a smart health notification
 
+    notification_id lets a caller that acknowledged the request before
+    the notification was stored hand out the final id up front.
+
     Track: Amazon Practical AI
     """
     notification = Notification(
@@ -103,13 +123,15 @@ async def create_notification(
         priority=priority,
         channels=channels,
         scheduled_time=scheduled_time,
-        metadata=metadata
+        metadata=metadata,
+        notification_id=notification_id
     )
 
     # Store notification
     if user_id not in notifications_store:
         notifications_store[user_id] = []
     notifications_store[user_id].append(notification)
+    await cache_delete(_notifications_cache_key(user_id))
 
     # Check if should send immediately
     if scheduled_time is None or scheduled_time <= datetime.now():
@@ -133,7 +155,8 @@ async def create_medication_reminder(
     dosage: str,
     time: str,
     frequency: str = "daily",
-    voice_enabled: bool = False
+    voice_enabled: bool = False,
+    notification_id: Optional[str] = None
 ) -> Dict:
     """
     Create medication reminder notification
@@ -160,7 +183,8 @@ async def create_medication_reminder(
             "frequency": frequency,
             "time": time,
             "voice_enabled": voice_enabled
-        }
+        },
+        notification_id=notification_id
     )
 
 
@@ -170,7 +194,8 @@ async def create_appointment_reminder(
     doctor_name: str,
     appointment_time: datetime,
     location: str,
-    reminder_hours_before: int = 24
+    reminder_hours_before: int = 24,
+    notification_id: Optional[str] = None
 ) -> Dict:
     """
     Create appointment reminder notification
@@ -195,14 +220,16 @@ async def create_appointment_reminder(
             "doctor_name": doctor_name,
             "appointment_time": appointment_time.isoformat(),
             "location": location
-        }
+        },
+        notification_id=notification_id
     )
 
 
 async def create_symptom_checkin(
     user_id: str,
     condition: str,
-    last_checkin_days_ago: int = 0
+    last_checkin_days_ago: int = 0,
+    notification_id: Optional[str] = None
 ) -> Dict:
     """
     Create symptom check-in notification
@@ -229,7 +256,8 @@ async def create_symptom_checkin(
         metadata={
             "condition": condition,
             "last_checkin_days_ago": last_checkin_days_ago
-        }
+        },
+        notification_id=notification_id
     )
 
 
@@ -239,7 +267,8 @@ async def create_outbreak_alert(
     location: str,
     severity: str,
     case_count: int,
-    recommendations: List[str]
+    recommendations: List[str],
+    notification_id: Optional[str] = None
 ) -> Dict:
     """
     Create outbreak alert notification
@@ -248,10 +277,7 @@ async def create_outbreak_alert(
 
     Track: Amazon Practical AI
     """
-    title = f"⚠️ {condition} Alert in {location}"
-    message = f"{condition} cases are up in {location} ({case_count} active cases - {severity} severity). Stay safe and follow health guidelines."
-
-    priority = NotificationPriority.HIGH if severity in ["moderate", "high"] else NotificationPriority.MEDIUM
+    title, message, priority = _outbreak_alert_content(condition, location, severity, case_count)
 
     return await create_notification(
         user_id=user_id,
@@ -266,7 +292,8 @@ async def create_outbreak_alert(
             "severity": severity,
             "case_count": case_count,
             "recommendations": recommendations
-        }
+        },
+        notification_id=notification_id
     )
 
 
@@ -274,7 +301,8 @@ async def create_followup_reminder(
     user_id: str,
     condition: str,
     treatment_started: datetime,
-    expected_improvement_days: int = 7
+    expected_improvement_days: int = 7,
+    notification_id: Optional[str] = None
 ) -> Dict:
     """
     Create follow-up care reminder
@@ -298,7 +326,8 @@ async def create_followup_reminder(
             "condition": condition,
             "treatment_started": treatment_started.isoformat(),
             "expected_improvement_days": expected_improvement_days
-        }
+        },
+        notification_id=notification_id
     )
 
 
@@ -338,29 +367,57 @@ async def get_user_notifications(
     user_id: str,
     notification_type: Optional[NotificationType] = None,
     status: Optional[str] = None,
-    limit: int = 50
+    limit: int = 50,
+    days: Optional[int] = None,
+    before: Optional[datetime] = None
 ) -> Dict:
     """
     Get user's notifications with filters
 
+    days limits results to notifications created in the last N days;
+    before pages further back ("load more") by only returning
+    notifications created earlier than it.
+
     Track: Amazon Practical AI
     """
-    user_notifications = notifications_store.get(user_id, [])
-
-    # Apply filters
-    filtered = user_notifications
-    if notification_type:
-        filtered = [n for n in filtered if n.notification_type == notification_type]
-    if status:
-        filtered = [n for n in filtered if n.status == status]
-
-    # Sort by created_at descending
-    filtered.sort(key=lambda n: n.created_at, reverse=True)
+    # One cache entry per user holding every filter combination, so a
+    # write only has to drop a single key
+    cache_key = _notifications_cache_key(user_id)
+    filter_key = (
+        f"{notification_type.value if notification_type else ''}:{status or ''}:{limit}"
+        f":{days or ''}:{before.isoformat() if before else ''}"
+    )
+    cached_lists = await cache_get(cache_key) or {}
+    if filter_key in cached_lists:
+        return cached_lists[filter_key]
 
-    # Limit results
-    filtered = filtered[:limit]
+    user_notifications = notifications_store.get(user_id, [])
 
-    return {
+    since = datetime.now() - timedelta(days=days) if days else None
+    if before and before.tzinfo:
+        # created_at is naive local time
+        before = before.astimezone().replace(tzinfo=None)
+
+    # Notifications are appended as they're created, so the user's list is
+    # already in created_at order: walk it backwards for newest first and
+    # stop at limit (or the start of the window) instead of filtering and
+    # sorting the whole history
+    filtered = []
+    if limit > 0:
+        for n in reversed(user_notifications):
+            if before and n.created_at >= before:
+                continue
+            if since and n.created_at < since:
+                break
+            if notification_type and n.notification_type != notification_type:
+                continue
+            if status and n.status != status:
+                continue
+            filtered.append(n)
+            if len(filtered) == limit:
+                break
+
+    result = {
         "user_id": user_id,
         "total_notifications": len(filtered),
         "unread_count": len([n for n in user_notifications if n.status in ["scheduled", "sent"]]),
@@ -383,6 +440,10 @@ async def get_user_notifications(
         ]
     }
 
+    cached_lists[filter_key] = result
+    await cache_set(cache_key, cached_lists, NOTIFICATIONS_CACHE_TTL)
+    return result
+
 
 async def mark_notification_read(user_id: str, notification_id: str) -> Dict:
     """Mark notification as read"""
@@ -392,6 +453,7 @@ async def mark_notification_read(user_id: str, notification_id: str) -> Dict:
         if notif.notification_id == notification_id:
             notif.read_at = datetime.now()
             notif.status = "read"
+            await cache_delete(_notifications_cache_key(user_id))
             return {
                 "success": True,
                 "notification_id": notification_id,
@@ -408,6 +470,7 @@ async def dismiss_notification(user_id: str, notification_id: str) -> Dict:
     for notif in user_notifications:
         if notif.notification_id == notification_id:
             notif.status = "dismissed"
+            await cache_delete(_notifications_cache_key(user_id))
             return {
                 "success": True,
                 "notification_id": notification_id,
@@ -439,6 +502,7 @@ async def set_notification_preferences(
         "preferred_channels": preferences.get("preferred_channels", ["in_app", "push"]),
         "updated_at": datetime.now().isoformat()
     }
+    await cache_delete(_preferences_cache_key(user_id))
 
     return {
         "success": True,
@@ -449,6 +513,11 @@ async def set_notification_preferences(
 
 async def get_notification_preferences(user_id: str) -> Dict:
     """Get user notification preferences"""
+    cache_key = _preferences_cache_key(user_id)
+    hit = await cache_get(cache_key)
+    if hit is not None:
+        return hit
+
     prefs = notification_preferences.get(user_id, {
         "medication_reminders": True,
         "appointment_reminders": True,
@@ -462,10 +531,12 @@ async def get_notification_preferences(user_id: str) -> Dict:
         "preferred_channels": ["in_app", "push"]
     })
 
-    return {
+    result = {
         "user_id": user_id,
         "preferences": prefs
     }
+    await cache_set(cache_key, result, PREFERENCES_CACHE_TTL)
+    return result
 
 
 async def send_bulk_outbreak_alerts(
@@ -480,24 +551,36 @@ async def send_bulk_outbreak_alerts(
 
     Track: Amazon Practical AI
     """
-    sent_count = 0
-    failed_count = 0
-
     recommendations = _get_outbreak_recommendations(condition, severity)
+    title, message, priority = _outbreak_alert_content(condition, location, severity, case_count)
+    metadata = {
+        "condition": condition,
+        "location": location,
+        "severity": severity,
+        "case_count": case_count,
+        "recommendations": recommendations
+    }
 
-    for user_id in affected_user_ids:
-        try:
-            await create_outbreak_alert(
-                user_id=user_id,
-                condition=condition,
-                location=location,
-                severity=severity,
-                case_count=case_count,
-                recommendations=recommendations
-            )
-            sent_count += 1
-        except Exception:
-            failed_count += 1
+    # Drop users who turned outbreak alerts off before doing any per-user
+    # work (in production: INSERT ... SELECT FROM unnest(:user_ids) joined
+    # to the preferences table on outbreak_alerts = true)
+    recipients = [
+        user_id for user_id in affected_user_ids
+        if notification_preferences.get(user_id, {}).get("outbreak_alerts", True)
+    ]
+
+    semaphore = asyncio.Semaphore(BULK_ALERT_MAX_CONCURRENT_CHUNKS)
+    chunks = [
+        recipients[i:i + BULK_ALERT_CHUNK_SIZE]
+        for i in range(0, len(recipients), BULK_ALERT_CHUNK_SIZE)
+    ]
+    results = await asyncio.gather(*(
+        _send_outbreak_alert_chunk(chunk, title, message, priority, metadata, semaphore)
+        for chunk in chunks
+    ))
+
+    sent_count = sum(sent for sent, _ in results)
+    failed_count = sum(failed for _, failed in results)
 
     return {
         "success": True,
@@ -505,7 +588,8 @@ async def send_bulk_outbreak_alerts(
         "location": location,
         "total_users": len(affected_user_ids),
         "sent_count": sent_count,
-        "failed_count": failed_count
+        "failed_count": failed_count,
+        "opted_out_count": len(affected_user_ids) - len(recipients)
     }
 
 
@@ -523,9 +607,12 @@ async def _send_notification(notification: Notification) -> bool:
     notification.sent_at = datetime.now()
     notification.status = "sent"
 
-    # If voice channel enabled, generate voice notification
+    # If voice channel enabled, generate voice notification off the
+    # request path; TTS takes hundreds of ms on a cache miss
     if NotificationChannel.VOICE in notification.channels:
-        await _send_voice_notification(notification)
+        task = asyncio.create_task(_send_voice_notification(notification))
+        _voice_tasks.add(task)
+        task.add_done_callback(_voice_tasks.discard)
 
     return True
 
@@ -543,9 +630,10 @@ async def _send_voice_notification(notification: Notification) -> bool:
 
     try:
         # Generate audio (in production, would call user's phone)
-        audio_bytes = await elevenlabs_service.text_to_speech(
+        audio_bytes = await elevenlabs_service.text_to_speech_cached(
             text=voice_message,
-            voice_id="21m00Tcm4TlvDq8ikWAM"  # Rachel voice
+            voice_id="21m00Tcm4TlvDq8ikWAM",  # Rachel voice
+            model_id=elevenlabs_service.REALTIME_TTS_MODEL
         )
 
         notification.metadata["voice_notification_sent"] = True
@@ -557,6 +645,105 @@ async def _send_voice_notification(notification: Notification) -> bool:
         return False
 
 
+async def mark_notification_failed(
+    user_id: str,
+    notification_id: str,
+    notification_type: NotificationType,
+    error: str
+) -> None:
+    """
+    Record that a notification acknowledged up front couldn't be created,
+    so the failure shows in the user's notification list
+    """
+    notification = next(
+        (n for n in notifications_store.get(user_id, []) if n.notification_id == notification_id),
+        None
+    )
+    if notification is None:
+        # Failed before it was stored; keep a placeholder under the acked id
+        notification = Notification(
+            user_id=user_id,
+            notification_type=notification_type,
+            title="Notification could not be created",
+            message="Something went wrong setting up this notification. Please try again.",
+            notification_id=notification_id
+        )
+        notifications_store.setdefault(user_id, []).append(notification)
+
+    notification.status = "failed"
+    notification.metadata["error"] = error
+    await cache_delete(_notifications_cache_key(user_id))
+
+
+def new_notification_id() -> str:
+    """Unique notification id, for acknowledging a notification before it's stored"""
+    return f"notif_{uuid.uuid4().hex}"
+
+
+def _preferences_cache_key(user_id: str) -> str:
+    return make_key("notif-prefs", user_id)
+
+
+def _notifications_cache_key(user_id: str) -> str:
+    return make_key("notif-list", user_id)
+
+
+def _outbreak_alert_content(
+    condition: str,
+    location: str,
+    severity: str,
+    case_count: int
+) -> Tuple[str, str, NotificationPriority]:
+    """Title, message and priority of an outbreak alert"""
+    title = f"⚠️ {condition} Alert in {location}"
+    message = f"{condition} cases are up in {location} ({case_count} active cases - {severity} severity). Stay safe and follow health guidelines."
+
+    priority = NotificationPriority.HIGH if severity in ["moderate", "high"] else NotificationPriority.MEDIUM
+
+    return title, message, priority
+
+
+async def _send_outbreak_alert_chunk(
+    user_ids: List[str],
+    title: str,
+    message: str,
+    priority: NotificationPriority,
+    metadata: Dict,
+    semaphore: asyncio.Semaphore
+) -> Tuple[int, int]:
+    """
+    Store one chunk of outbreak alerts in a single pass, then deliver them
+
+    Returns (sent_count, failed_count)
+    """
+    async with semaphore:
+        notifications = [
+            Notification(
+                user_id=user_id,
+                notification_type=NotificationType.OUTBREAK_ALERT,
+                title=title,
+                message=message,
+                priority=priority,
+                channels=[NotificationChannel.IN_APP, NotificationChannel.PUSH],
+                metadata=dict(metadata)
+            )
+            for user_id in user_ids
+        ]
+
+        # Bulk insert (in production: one executemany/insert_many per chunk)
+        for notification in notifications:
+            notifications_store.setdefault(notification.user_id, []).append(notification)
+        await cache_delete(*(_notifications_cache_key(user_id) for user_id in user_ids))
+
+        delivered = await asyncio.gather(
+            *(_send_notification(notification) for notification in notifications),
+            return_exceptions=True
+        )
+
+    sent_count = sum(1 for result in delivered if result is True)
+    return sent_count, len(notifications) - sent_count
+
+
 def _get_outbreak_recommendations(condition: str, severity: str) -> List[str]:
     """Get outbreak-specific recommendations"""
     recommendations = {
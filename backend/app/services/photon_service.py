@@ -10,10 +10,18 @@ Implements true human-AI collaboration where:
 Track: Photon - Hybrid Intelligence
 """
 
+from collections import OrderedDict, deque
 from typing import Dict, List, Optional
 from datetime import datetime
 from enum import Enum
 import json
+import time
+
+# Session store bounds: least recently used sessions go first, idle ones expire
+HYBRID_SESSION_MAX = 10_000
+HYBRID_SESSION_IDLE_SECONDS = 3600
+# Oldest messages drop off long conversations
+HYBRID_SESSION_HISTORY_MAX = 200
 
 class CollaborationStage(str, Enum):
     AI_ANALYZING = "ai_analyzing"
@@ -34,14 +42,44 @@ class HybridSession:
         self.ai_analysis = None
         self.human_review = None
         self.final_recommendation = None
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=HYBRID_SESSION_HISTORY_MAX)
         self.confidence_scores = {"ai": 0.0, "human": 0.0, "hybrid": 0.0}
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
+        self.last_access = time.monotonic()
+
+
+# In-memory session store (replace with Redis/DB in production), kept in
+# least-recently-used order
+hybrid_sessions: "OrderedDict[str, HybridSession]" = OrderedDict()
+
+
+def _get_session(session_id: str) -> Optional[HybridSession]:
+    session = hybrid_sessions.get(session_id)
+    if session is None:
+        return None
+
+    now = time.monotonic()
+    if now - session.last_access > HYBRID_SESSION_IDLE_SECONDS:
+        hybrid_sessions.pop(session_id, None)
+        return None
+
+    session.last_access = now
+    hybrid_sessions.move_to_end(session_id)
+    return session
 
 
-# In-memory session store (replace with Redis/DB in production)
-hybrid_sessions: Dict[str, HybridSession] = {}
+def _store_session(session: HybridSession):
+    hybrid_sessions[session.session_id] = session
+    hybrid_sessions.move_to_end(session.session_id)
+
+    # Sweep from the least recently used end: over capacity or idle too long
+    cutoff = time.monotonic() - HYBRID_SESSION_IDLE_SECONDS
+    while hybrid_sessions:
+        oldest = next(iter(hybrid_sessions.values()))
+        if len(hybrid_sessions) <= HYBRID_SESSION_MAX and oldest.last_access >= cutoff:
+            break
+        hybrid_sessions.popitem(last=False)
 
 
 async def start_hybrid_consultation(
@@ -62,7 +100,7 @@ async def start_hybrid_consultation(
 
     # Create hybrid session
     session = HybridSession(session_id=session_id, patient_data=patient_data)
-    hybrid_sessions[session_id] = session
+    _store_session(session)
 
     # Initiate AI analysis (would call Dedalus multi-agent in real implementation)
     ai_analysis = await _get_ai_analysis(symptoms, patient_data, urgency)
@@ -110,10 +148,9 @@ async def submit_human_review(
 
     Track: Photon Hybrid Intelligence
     """
-    if session_id not in hybrid_sessions:
+    session = _get_session(session_id)
+    if session is None:
         return {"error": "Session not found"}
-
-    session = hybrid_sessions[session_id]
     session.stage = CollaborationStage.HUMAN_REVIEWING
     session.human_review = {
         "doctor_id": doctor_id,
@@ -167,11 +204,10 @@ async def get_hybrid_consultation_status(session_id: str) -> Dict:
 
     Shows collaboration workflow in real-time
     """
-    if session_id not in hybrid_sessions:
+    session = _get_session(session_id)
+    if session is None:
         return {"error": "Session not found"}
 
-    session = hybrid_sessions[session_id]
-
     return {
         "session_id": session_id,
         "stage": session.stage.value,
@@ -179,7 +215,7 @@ async def get_hybrid_consultation_status(session_id: str) -> Dict:
         "human_review": session.human_review,
         "final_recommendation": session.final_recommendation,
         "confidence_scores": session.confidence_scores,
-        "conversation_history": session.conversation_history,
+        "conversation_history": list(session.conversation_history),
         "collaboration_timeline": {
             "started": session.created_at.isoformat(),
             "last_updated": session.updated_at.isoformat(),
@@ -203,11 +239,10 @@ async def add_collaboration_message(
 
     Track: Photon Hybrid Intelligence
     """
-    if session_id not in hybrid_sessions:
+    session = _get_session(session_id)
+    if session is None:
         return {"error": "Session not found"}
 
-    session = hybrid_sessions[session_id]
-
     message_entry = {
         "timestamp": datetime.now().isoformat(),
         "actor": actor,
@@ -249,11 +284,10 @@ async def request_human_escalation(
 
     Track: Photon Hybrid Intelligence
     """
-    if session_id not in hybrid_sessions:
+    session = _get_session(session_id)
+    if session is None:
         return {"error": "Session not found"}
 
-    session = hybrid_sessions[session_id]
-
     if session.stage == CollaborationStage.COMPLETED:
         session.stage = CollaborationStage.HUMAN_REVIEW_PENDING
 
@@ -434,11 +468,10 @@ async def format_for_imessage(session_id: str) -> Dict:
 
     iMessage Kit Integration Point
     """
-    if session_id not in hybrid_sessions:
+    session = _get_session(session_id)
+    if session is None:
         return {"error": "Session not found"}
 
-    session = hybrid_sessions[session_id]
-
     # Format conversation for iMessage bubbles
     messages = []
     for entry in session.conversation_history:
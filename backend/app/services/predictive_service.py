@@ -354,7 +354,7 @@ Patient Profile: {json.dumps(patient_profile or {})}
 
 Provide brief, actionable insights. Focus on key factors that influence success."""
 
-        response = gemini_model.generate_content(prompt)
+        response = await gemini_model.generate_content_async(prompt)
         return response.text.strip()
     except:
         return f"Based on historical data, {treatment} has shown {int(success_prob * 100)}% success rate for {condition}."
@@ -374,7 +374,7 @@ Predicted Timeline: {int(days)} days
 
 Brief insight about what affects this timeline."""
 
-        response = gemini_model.generate_content(prompt)
+        response = await gemini_model.generate_content_async(prompt)
         return response.text.strip()
     except:
         return f"Timeline based on urgency level and healthcare system capacity."
@@ -395,7 +395,7 @@ async def _get_ai_trend_analysis(trends: List[Dict], location: str, days: int) -
 
 Provide 2-3 sentence summary with key takeaways."""
 
-        response = gemini_model.generate_content(prompt)
+        response = await gemini_model.generate_content_async(prompt)
         return response.text.strip()
     except:
         return f"Health trend analysis for {location} over {days} days."
@@ -12,17 +12,37 @@ Tracks:
 
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
+import asyncio
 import random
-from collections import defaultdict
+import time
+from collections import defaultdict, deque
 import json
 
 
+FEED_SYMPTOMS = ["Headache", "Fever", "Cough", "Fatigue", "Nausea", "Sore throat", "Body aches"]
+FEED_LOCATIONS = ["Boston, MA", "New York, NY", "Philadelphia, PA", "Princeton, NJ"]
+FEED_MAX_REPORTS = 1000
+
+# Just under the dashboard stream's 5s tick, so each tick reads fresh data
+# and the alerts stream reuses the dashboard's read instead of its own
+SNAPSHOT_MAX_AGE_SECONDS = 4.5
+
+
+def normalize_location(location: Optional[str]) -> Optional[str]:
+    """Lookup key for a location filter ("  Boston, MA" -> "boston, ma")"""
+    return location.strip().lower() if location else None
+
+
+# Normalized location key -> display name for every location the feed covers
+KNOWN_LOCATIONS: Dict[str, str] = {normalize_location(loc): loc for loc in FEED_LOCATIONS}
+
+
 # Real-time symptom feed (simulated - replace with Snowflake streaming in production)
 class SymptomFeed:
     """Simulates real-time symptom reports"""
 
     def __init__(self):
-        self.recent_symptoms = []
+        self.recent_symptoms = deque(maxlen=FEED_MAX_REPORTS)
         self.symptom_counts = defaultdict(int)
 
     def add_symptom_report(self, location: str, symptom: str, severity: int):
@@ -34,13 +54,10 @@ class SymptomFeed:
             "severity": severity,
             "id": f"symptom_{datetime.now().timestamp()}"
         }
+        # The bounded deque keeps only the last FEED_MAX_REPORTS reports
         self.recent_symptoms.append(report)
         self.symptom_counts[symptom] += 1
 
-        # Keep only last 1000 reports
-        if len(self.recent_symptoms) > 1000:
-            self.recent_symptoms = self.recent_symptoms[-1000:]
-
         return report
 
 
@@ -160,26 +177,27 @@ async def get_live_symptom_feed(
     """
     Get live symptom feed (streaming data)
 
-    Real-time symptom reports as they come in
+    Real-time symptom reports as they come in. location may be a display
+    name or a normalize_location() key; known locations resolve to their
+    display name via KNOWN_LOCATIONS.
     Track: Amazon Practical AI
     """
     # In production, query Snowflake with time-series data
     # For now, generate realistic mock feed
 
     cutoff_time = datetime.now() - timedelta(minutes=timeframe_minutes)
+    if location:
+        location = KNOWN_LOCATIONS.get(normalize_location(location), location)
 
     feed_items = []
     for i in range(limit):
         timestamp = datetime.now() - timedelta(minutes=random.randint(0, timeframe_minutes))
 
-        symptoms = ["Headache", "Fever", "Cough", "Fatigue", "Nausea", "Sore throat", "Body aches"]
-        locations = ["Boston, MA", "New York, NY", "Philadelphia, PA", "Princeton, NJ"]
-
         item = {
             "id": f"feed_{timestamp.timestamp()}_{i}",
             "timestamp": timestamp.isoformat(),
-            "location": location if location else random.choice(locations),
-            "symptom": random.choice(symptoms),
+            "location": location if location else random.choice(FEED_LOCATIONS),
+            "symptom": random.choice(FEED_SYMPTOMS),
             "severity": random.randint(1, 10),
             "age_group": random.choice(["18-30", "31-50", "51-65", "65+"]),
             "minutes_ago": int((datetime.now() - timestamp).total_seconds() / 60)
@@ -275,6 +293,34 @@ async def detect_outbreaks(
     }
 
 
+_snapshot: Optional[Dict] = None
+_snapshot_at = 0.0
+_snapshot_lock = asyncio.Lock()
+
+
+async def get_combined_snapshot() -> Dict:
+    """
+    Dashboard metrics and outbreak detection from one upstream read
+
+    Both come from the same symptom store, so the WebSocket streams share
+    one recent snapshot instead of querying it separately. Concurrent
+    callers wait on the in-flight read.
+    Track: Amazon Practical AI + Chestnut Forty
+    """
+    global _snapshot, _snapshot_at
+
+    async with _snapshot_lock:
+        if _snapshot is None or time.monotonic() - _snapshot_at >= SNAPSHOT_MAX_AGE_SECONDS:
+            # In production: one Snowflake scan split into both views
+            dashboard, outbreaks = await asyncio.gather(
+                get_realtime_dashboard(),
+                detect_outbreaks()
+            )
+            _snapshot = {"dashboard": dashboard, "outbreaks": outbreaks}
+            _snapshot_at = time.monotonic()
+        return _snapshot
+
+
 async def get_geographic_heatmap(
     condition: Optional[str] = None,
     timeframe_days: int = 7
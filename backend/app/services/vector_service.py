@@ -1,9 +1,13 @@
 # backend/app/services/vector_service.py
 from pinecone import Pinecone
+import asyncio
 import os
 from typing import List, Dict
 from dotenv import load_dotenv
 import google.generativeai as genai
+from ..utils.batcher import MicroBatcher
+from ..utils.cache import make_key
+from ..utils.single_flight import single_flight
 
 # load environment variables
 load_dotenv()
@@ -32,31 +36,45 @@ async def create_embedding(text: str) -> List[float]:
     """
     Create 2048-dim embedding using Google Gemini (padded to match Pinecone index)
     Using Gemini embeddings for hackathon track!
+
+    Concurrent callers are coalesced into one batched embedding request.
     """
     if not gemini_api_key:
         print("Warning: Gemini not initialized, using fallback zero vector")
         return [0.0] * 2048
 
+    return await _embedding_batcher.submit(text)
+
+
+async def _embed_batch(texts: List[str]) -> List[List[float]]:
     try:
         # Use Gemini's embedding model (returns 768 dimensions)
-        result = genai.embed_content(
+        # The SDK call blocks; keep it off the event loop
+        result = await asyncio.to_thread(
+            genai.embed_content,
             model="models/text-embedding-004",
-            content=text,
+            content=texts,
             task_type="retrieval_document"
         )
 
-        embedding = result['embedding']
-
         # Pad from 768 to 2048 dimensions with zeros
-        if len(embedding) < 2048:
-            padding = [0.0] * (2048 - len(embedding))
-            embedding = embedding + padding
-
-        return embedding
+        return [
+            embedding + [0.0] * (2048 - len(embedding)) if len(embedding) < 2048 else embedding
+            for embedding in result['embedding']
+        ]
     except Exception as e:
         print(f"Gemini embedding error: {e}")
-        # Return zero vector as fallback
-        return [0.0] * 2048
+        # Return zero vectors as fallback
+        return [[0.0] * 2048 for _ in texts]
+
+
+# Embedding requests that arrive while one is in flight share the next call
+_embedding_batcher = MicroBatcher(_embed_batch, max_items=32)
+
+
+def close():
+    """Stop the embedding batcher worker"""
+    _embedding_batcher.close()
 
 async def upsert_symptom_vector(symptom_id: str, description: str, metadata: Dict):
     """Add a symptom to Pinecone"""
@@ -71,11 +89,29 @@ async def upsert_symptom_vector(symptom_id: str, description: str, metadata: Dic
     return {"status": "success", "id": symptom_id}
 
 async def query_similar_vectors(symptom: str, top_k: int = 5):
-    """Find similar symptoms"""
+    """
+    Find similar symptoms
+
+    Concurrent queries for the same text share one embedding + Pinecone
+    round trip; distinct texts share batched embedding calls.
+    """
+    return await single_flight(
+        make_key("vector-query", symptom, top_k),
+        lambda: _query_similar_vectors(symptom, top_k)
+    )
+
+
+async def _query_similar_vectors(symptom: str, top_k: int):
+    # Without an index the query can only fail; skip the embedding call too
+    if index is None:
+        return generate_fake_matches()
+
     query_vector = await create_embedding(symptom)
     
     try:
-        results = index.query(
+        # Similarity search runs server-side in Pinecone; the client call blocks
+        results = await asyncio.to_thread(
+            index.query,
             vector=query_vector,
             top_k=top_k,
             include_metadata=True
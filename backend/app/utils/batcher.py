@@ -0,0 +1,88 @@
+# backend/app/utils/batcher.py
+"""
+Micro-batching for bursty write paths
+
+Callers submit one item and await its own result; a single worker hands
+everything queued at that moment (up to max_items) to a bulk handler in
+one call. With max_wait=0 an idle batcher adds no latency - batches only
+form from items that pile up while the previous flush is running.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+
+class MicroBatcher:
+    """Funnel individual submissions into bulk handler calls"""
+
+    def __init__(
+        self,
+        flush: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_items: int = 64,
+        max_wait: float = 0.0
+    ):
+        # flush must return one result per item, in order
+        self._flush = flush
+        self.max_items = max_items
+        self.max_wait = max_wait
+        self._queue: "asyncio.Queue[Tuple[Any, asyncio.Future]]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queue item for the next batch and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return await future
+
+    def close(self):
+        """Stop the worker (queued submissions are cancelled)"""
+        if self._worker is not None:
+            self._worker.cancel()
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+
+    async def _next_batch(self) -> List[Tuple[Any, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_items:
+            remaining = deadline - loop.time()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                results = await self._flush([item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            if len(results) != len(batch):
+                # Never leave a submitter waiting on a result that won't come
+                error = RuntimeError(
+                    f"Batch flush returned {len(results)} results for {len(batch)} items"
+                )
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                # A submitter that went away leaves a cancelled future behind
+                if not future.done():
+                    future.set_result(result)
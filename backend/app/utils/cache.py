@@ -0,0 +1,142 @@
+# backend/app/utils/cache.py
+"""
+TTL cache for JSON-serializable results
+
+Backed by the shared Redis client when REDIS_URL is set, otherwise by
+per-process LRU dicts, one per key namespace, so a burst of writes in one
+namespace can't evict another's entries. Keys are hashed so user
+identifiers never appear in Redis.
+"""
+
+import functools
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from ..db import redis_client
+
+CACHE_PREFIX = "sensoryx:cache:"
+# Per-namespace bound for the local fallback; see set_local_capacity
+LOCAL_CACHE_MAX_ENTRIES = 1024
+
+_local_caches: "Dict[str, OrderedDict[str, Tuple[float, Any]]]" = {}
+_local_capacity: Dict[str, int] = {}
+
+
+def set_local_capacity(namespace: str, max_entries: int) -> None:
+    """
+    Size the local fallback store for one namespace (default
+    LOCAL_CACHE_MAX_ENTRIES); for entries that must outlive unrelated
+    traffic, such as idempotency keys or stored results
+    """
+    _local_capacity[namespace] = max_entries
+
+
+def _local_store(key: str) -> "OrderedDict[str, Tuple[float, Any]]":
+    namespace = key.partition(":")[0]
+    store = _local_caches.get(namespace)
+    if store is None:
+        store = _local_caches[namespace] = OrderedDict()
+    return store
+
+
+def make_key(namespace: str, *args, **kwargs) -> str:
+    """Build a cache key from a namespace and call arguments"""
+    raw = json.dumps([args, kwargs], sort_keys=True, default=str)
+    return f"{namespace}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Return the cached value for key, or None on miss"""
+    if redis_client is None:
+        store = _local_store(key)
+        entry = store.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            store.pop(key, None)
+            return None
+        store.move_to_end(key)
+        return value
+
+    try:
+        raw = await redis_client.get(CACHE_PREFIX + key)
+    except Exception as e:
+        print(f"Cache read error: {e}")
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+async def cache_set(key: str, value: Any, ttl: int) -> None:
+    """Store value under key for ttl seconds"""
+    if redis_client is None:
+        store = _local_store(key)
+        store[key] = (time.monotonic() + ttl, value)
+        store.move_to_end(key)
+        max_entries = _local_capacity.get(key.partition(":")[0], LOCAL_CACHE_MAX_ENTRIES)
+        while len(store) > max_entries:
+            store.popitem(last=False)
+        return
+
+    try:
+        await redis_client.set(CACHE_PREFIX + key, json.dumps(value), ex=ttl)
+    except Exception as e:
+        print(f"Cache write error: {e}")
+
+
+async def cache_add(key: str, value: Any, ttl: int) -> bool:
+    """Store value under key only if the key isn't cached; True if stored"""
+    if redis_client is None:
+        if await cache_get(key) is not None:
+            return False
+        await cache_set(key, value, ttl)
+        return True
+
+    try:
+        stored = await redis_client.set(CACHE_PREFIX + key, json.dumps(value), ex=ttl, nx=True)
+    except Exception as e:
+        print(f"Cache write error: {e}")
+        return True
+    return bool(stored)
+
+
+async def cache_delete(*keys: str) -> None:
+    """Drop keys from the cache (no-op for keys that aren't cached)"""
+    if not keys:
+        return
+
+    if redis_client is None:
+        for key in keys:
+            _local_store(key).pop(key, None)
+        return
+
+    try:
+        await redis_client.delete(*(CACHE_PREFIX + key for key in keys))
+    except Exception as e:
+        print(f"Cache delete error: {e}")
+
+
+def cached(namespace: str, ttl: int) -> Callable:
+    """
+    Cache an async function's result keyed on its arguments
+
+    Safe on FastAPI endpoints: functools.wraps keeps the signature FastAPI
+    inspects for parameter parsing.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = make_key(namespace, *args, **kwargs)
+            hit = await cache_get(key)
+            if hit is not None:
+                return hit
+
+            result = await func(*args, **kwargs)
+            await cache_set(key, result, ttl)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,61 @@
+# backend/app/utils/http_cache.py
+"""
+HTTP caching headers for pre-serialized JSON responses
+
+Adds Cache-Control and a strong ETag so browsers and CDNs can revalidate
+with If-None-Match and get a bodiless 304 instead of the full payload.
+"""
+
+import hashlib
+from typing import Optional
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Compare opaque tags, ignoring weak prefixes added by intermediaries
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def cacheable_json(
+    request: Request,
+    body: bytes,
+    max_age: int,
+    etag: Optional[str] = None
+) -> Response:
+    """
+    Return body as a publicly cacheable JSON response, or 304 when the
+    client's If-None-Match already matches
+
+    Pass etag for bodies built once at import so it isn't rehashed per request
+    """
+    etag = etag or make_etag(body)
+    headers = {
+        "Cache-Control": f"public, max-age={max_age}",
+        "ETag": etag
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def private_json(body: bytes) -> Response:
+    """
+    Return body as JSON that shared caches must not store (user-specific
+    responses)
+    """
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": "private, no-store"}
+    )
@@ -0,0 +1,94 @@
+# backend/app/utils/rate_limiter.py
+"""
+Per-minute quota for outbound API calls
+
+Counts requests (and optionally units such as characters or tokens) in
+one-minute windows. With REDIS_URL set the counters live in Redis so
+every worker shares the same quota; otherwise each process keeps its
+own. acquire() waits for the next window instead of letting the call
+hit the provider and come back as a 429.
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+from ..db import redis_client
+
+RATE_LIMIT_PREFIX = "sensoryx:ratelimit:"
+
+# Atomically add to both window counters; returns the new totals
+_INCR_SCRIPT = """
+local requests = redis.call('INCRBY', KEYS[1], 1)
+local units = redis.call('INCRBY', KEYS[2], ARGV[1])
+if requests == 1 then redis.call('EXPIRE', KEYS[1], ARGV[2]) end
+if units == tonumber(ARGV[1]) then redis.call('EXPIRE', KEYS[2], ARGV[2]) end
+return {requests, units}
+"""
+
+# Give back a reservation that didn't fit in the window
+_DECR_SCRIPT = """
+redis.call('DECRBY', KEYS[1], 1)
+redis.call('DECRBY', KEYS[2], ARGV[1])
+return 1
+"""
+
+
+class RateLimiter:
+    """Shared requests-per-minute (and units-per-minute) limit"""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int,
+        units_per_minute: Optional[int] = None
+    ):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.units_per_minute = units_per_minute
+        self._local: Dict[int, Tuple[int, int]] = {}
+
+    async def acquire(self, units: int = 0):
+        """Wait until the call fits in the current minute's quota"""
+        while True:
+            window = int(time.time() // 60)
+            requests, used = await self._reserve(window, units)
+
+            fits = requests <= self.requests_per_minute
+            if self.units_per_minute:
+                # A single call larger than the whole quota still goes through alone
+                fits = fits and (used <= self.units_per_minute or used == units)
+            if fits:
+                return
+
+            await self._release(window, units)
+            await asyncio.sleep((window + 1) * 60 - time.time())
+
+    async def _reserve(self, window: int, units: int) -> Tuple[int, int]:
+        if redis_client is not None:
+            try:
+                keys = self._keys(window)
+                requests, used = await redis_client.eval(_INCR_SCRIPT, 2, *keys, units, 120)
+                return int(requests), int(used)
+            except Exception as e:
+                print(f"Rate limiter error, using local quota: {e}")
+
+        # Keep only the current window
+        requests, used = self._local.get(window, (0, 0))
+        self._local = {window: (requests + 1, used + units)}
+        return requests + 1, used + units
+
+    async def _release(self, window: int, units: int):
+        if redis_client is not None:
+            try:
+                await redis_client.eval(_DECR_SCRIPT, 2, *self._keys(window), units)
+                return
+            except Exception as e:
+                print(f"Rate limiter error, using local quota: {e}")
+
+        if window in self._local:
+            requests, used = self._local[window]
+            self._local[window] = (requests - 1, used - units)
+
+    def _keys(self, window: int) -> Tuple[str, str]:
+        base = f"{RATE_LIMIT_PREFIX}{self.name}:{window}"
+        return f"{base}:requests", f"{base}:units"
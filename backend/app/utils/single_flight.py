@@ -0,0 +1,25 @@
+# backend/app/utils/single_flight.py
+"""
+Request coalescing for hot read paths
+
+Concurrent callers asking for the same key share one in-flight call
+instead of each re-running it. Nothing is cached: once the call
+finishes, the next caller starts a fresh one.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+async def single_flight(key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+    """Await func(), sharing the call with any concurrent caller for key"""
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(func())
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # Shield so one caller disconnecting doesn't cancel the shared call
+    return await asyncio.shield(future)
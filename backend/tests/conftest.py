@@ -0,0 +1,7 @@
+import sys
+import pathlib
+
+# Ensure backend/ is on sys.path so imports like `from app.utils import cache` work
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from app.utils.batcher import MicroBatcher
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+def test_results_come_back_in_submission_order():
+    batches = []
+
+    async def flush(items):
+        batches.append(list(items))
+        await asyncio.sleep(0)
+        return [item * 10 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(flush, max_items=3)
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in range(7)))
+        finally:
+            batcher.close()
+
+    assert run(scenario()) == [0, 10, 20, 30, 40, 50, 60]
+    # Everything submitted together is flushed in order, max_items at a time
+    assert [item for batch in batches for item in batch] == list(range(7))
+    assert all(len(batch) <= 3 for batch in batches)
+
+
+def test_flush_error_reaches_every_submitter_and_worker_keeps_going():
+    calls = []
+
+    async def flush(items):
+        calls.append(list(items))
+        if len(calls) == 1:
+            raise ValueError("warehouse down")
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(flush, max_items=10)
+        try:
+            failed = await asyncio.gather(
+                batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+            )
+            recovered = await batcher.submit("c")
+            return failed, recovered
+        finally:
+            batcher.close()
+
+    failed, recovered = run(scenario())
+    assert [type(e) for e in failed] == [ValueError, ValueError]
+    assert recovered == "c"
+
+
+def test_short_flush_result_fails_batch_instead_of_hanging():
+    async def flush(items):
+        return items[:1]
+
+    async def scenario():
+        batcher = MicroBatcher(flush, max_items=10)
+        try:
+            return await asyncio.gather(
+                batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+            )
+        finally:
+            batcher.close()
+
+    results = run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_close_cancels_queued_submissions():
+    release = None
+
+    async def flush(items):
+        await release.wait()
+        return items
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        batcher = MicroBatcher(flush, max_items=1)
+        first = asyncio.ensure_future(batcher.submit("a"))
+        second = asyncio.ensure_future(batcher.submit("b"))
+        await asyncio.sleep(0.01)
+        batcher.close()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        first.cancel()
+
+    run(scenario())
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from app.utils import cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Local fallback only, starting empty, on a clock the test controls
+    clock = FakeClock()
+    monkeypatch.setattr(cache, "redis_client", None)
+    monkeypatch.setattr(cache, "time", clock)
+    monkeypatch.setattr(cache, "_local_caches", {})
+    monkeypatch.setattr(cache, "_local_capacity", {})
+    return clock
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_entry_expires_after_ttl(clock):
+    run(cache.cache_set("ns:a", {"v": 1}, ttl=60))
+
+    clock.now += 59
+    assert run(cache.cache_get("ns:a")) == {"v": 1}
+
+    clock.now += 2
+    assert run(cache.cache_get("ns:a")) is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache.set_local_capacity("ns", 2)
+    run(cache.cache_set("ns:a", 1, ttl=60))
+    run(cache.cache_set("ns:b", 2, ttl=60))
+
+    # Reading a refreshes it, so b is now the oldest
+    assert run(cache.cache_get("ns:a")) == 1
+    run(cache.cache_set("ns:c", 3, ttl=60))
+
+    assert run(cache.cache_get("ns:a")) == 1
+    assert run(cache.cache_get("ns:b")) is None
+    assert run(cache.cache_get("ns:c")) == 3
+
+
+def test_namespaces_do_not_evict_each_other(clock):
+    cache.set_local_capacity("busy", 10)
+    run(cache.cache_set("idempotency:key", "ack", ttl=60))
+
+    for i in range(cache.LOCAL_CACHE_MAX_ENTRIES + 50):
+        run(cache.cache_set(f"busy:{i}", i, ttl=60))
+
+    assert run(cache.cache_get("idempotency:key")) == "ack"
+    assert len(cache._local_caches["busy"]) == 10
+
+
+def test_cache_add_only_stores_missing_keys(clock):
+    assert run(cache.cache_add("ns:a", "first", ttl=60)) is True
+    assert run(cache.cache_add("ns:a", "second", ttl=60)) is False
+    assert run(cache.cache_get("ns:a")) == "first"
+
+    # Once expired the key is free again
+    clock.now += 61
+    assert run(cache.cache_add("ns:a", "third", ttl=60)) is True
+    assert run(cache.cache_get("ns:a")) == "third"
+
+
+def test_cache_delete_drops_keys(clock):
+    run(cache.cache_set("ns:a", 1, ttl=60))
+    run(cache.cache_delete("ns:a", "ns:missing"))
+    assert run(cache.cache_get("ns:a")) is None
+
+
+def test_cached_reuses_result_per_arguments(clock):
+    calls = []
+
+    @cache.cached("square", ttl=60)
+    async def square(x):
+        calls.append(x)
+        return x * x
+
+    async def scenario():
+        return [await square(3), await square(3), await square(4)]
+
+    assert run(scenario()) == [9, 9, 16]
+    assert calls == [3, 4]
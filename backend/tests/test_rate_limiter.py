@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from app.utils import rate_limiter
+from app.utils.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 60 * 1000.0  # start of a window
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Local quota only, on a clock the test controls
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "redis_client", None)
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_requests_within_quota_do_not_wait(clock):
+    limiter = RateLimiter("test", requests_per_minute=3)
+
+    async def scenario():
+        for _ in range(3):
+            await limiter.acquire()
+
+    run(scenario())
+    assert clock.sleeps == []
+
+
+def test_over_quota_waits_for_next_window(clock):
+    limiter = RateLimiter("test", requests_per_minute=2)
+    clock.now += 15  # 45s left in this window
+
+    async def scenario():
+        for _ in range(3):
+            await limiter.acquire()
+
+    run(scenario())
+    assert clock.sleeps == [45]
+    # The third call is counted in the new window only
+    assert limiter._local == {int(clock.now // 60): (1, 0)}
+
+
+def test_window_rollover_resets_counts(clock):
+    limiter = RateLimiter("test", requests_per_minute=1)
+
+    async def scenario():
+        await limiter.acquire()
+        clock.now += 60
+        await limiter.acquire()
+
+    run(scenario())
+    assert clock.sleeps == []
+
+
+def test_units_quota(clock):
+    limiter = RateLimiter("test", requests_per_minute=100, units_per_minute=1000)
+
+    async def scenario():
+        await limiter.acquire(units=600)
+        await limiter.acquire(units=600)  # doesn't fit: next window
+
+    run(scenario())
+    assert clock.sleeps == [60]
+
+
+def test_call_larger_than_quota_goes_through_alone(clock):
+    limiter = RateLimiter("test", requests_per_minute=100, units_per_minute=1000)
+
+    async def scenario():
+        await limiter.acquire(units=5000)
+
+    run(scenario())
+    assert clock.sleeps == []
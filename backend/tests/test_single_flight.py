@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from app.utils import single_flight as sf
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+def test_concurrent_callers_share_one_call():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def scenario():
+        shared = await asyncio.gather(*(sf.single_flight("k", fetch) for _ in range(5)))
+        # Nothing is cached: the next caller starts a fresh call
+        fresh = await sf.single_flight("k", fetch)
+        return shared, fresh
+
+    shared, fresh = run(scenario())
+    assert shared == [1] * 5
+    assert fresh == 2
+    assert "k" not in sf._inflight
+
+
+def test_different_keys_do_not_share():
+    async def scenario():
+        async def value(v):
+            await asyncio.sleep(0)
+            return v
+
+        return await asyncio.gather(
+            sf.single_flight("a", lambda: value("a")),
+            sf.single_flight("b", lambda: value("b")),
+        )
+
+    assert run(scenario()) == ["a", "b"]
+
+
+def test_cancelled_caller_does_not_cancel_shared_call():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(sf.single_flight("k", fetch))
+        second = asyncio.ensure_future(sf.single_flight("k", fetch))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        release.set()
+        return await second
+
+    assert run(scenario()) == "done"
+
+
+def test_error_reaches_every_caller_and_clears_key():
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    async def scenario():
+        return await asyncio.gather(
+            sf.single_flight("k", fail), sf.single_flight("k", fail),
+            return_exceptions=True
+        )
+
+    results = run(scenario())
+    assert [type(r) for r in results] == [ValueError, ValueError]
+    assert "k" not in sf._inflight